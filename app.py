@@ -1,33 +1,14 @@
 import streamlit as st
 from PIL import Image
-import torch
-import torch.nn as nn
-from torchvision import models, transforms
 import os
+import sys
 from datetime import datetime
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'faceemotion'))
+
 # 🛠️ Set Streamlit page config
 st.set_page_config(page_title="Monkeypox Classifier", layout="centered")
 
-# ✅ Class names
-class_names = ['Monkey Pox', 'Others']
-
-# 🔁 Preprocessing function
-def preprocess_image(image):
-    transform = transforms.Compose([
-        transforms.Resize((224, 224)),
-        transforms.ToTensor(),
-    ])
-    return transform(image).unsqueeze(0)
-
-# 🎯 Load the model
-device = torch.device("mps" if torch.backends.mps.is_available() else "cpu")
-model = models.resnet18(pretrained=False)
-model.fc = nn.Linear(model.fc.in_features, 2)
-model.load_state_dict(torch.load("best_model.pth", map_location=device))
-model = model.to(device)
-model.eval()
-
 # 🚀 Streamlit UI
 st.title("🧠 Monkeypox Skin Lesion Classifier")
 
@@ -36,12 +17,22 @@ if uploaded_file is not None:
     image = Image.open(uploaded_file).convert("RGB")
     st.image(image, caption="Uploaded Image", use_column_width=True)
 
+    # 🎯 Load the model on first analysis (shared and warmed up once per process);
+    # torch is imported here so the page itself renders without it
+    from monkeypox_model.registry import get_model
+    from monkeypox_model.quality import quality_message
+    with st.spinner("🤖 Loading model..."):
+        model = get_model()
+    if model is None:
+        st.error("❌ Failed to load the classification model. Please check the model file.")
+        st.stop()
+
     # Prediction
-    input_tensor = preprocess_image(image).to(device)
-    with torch.no_grad():
-        outputs = model(input_tensor)
-        _, predicted = torch.max(outputs, 1)
-        predicted_class = class_names[predicted.item()]
+    prediction = model.predict(image)
+    predicted_class = prediction['predicted_class']
+    if predicted_class is None:
+        st.warning(f"📷 Image not analyzed: {quality_message(prediction['quality'])}")
+        st.stop()
 
     st.markdown(f"### 🔍 Predicted: `{predicted_class}`")
 
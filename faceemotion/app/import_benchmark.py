@@ -0,0 +1,99 @@
+"""
+Import-Time Benchmark
+Measures how long each app entry point takes to import in a fresh
+interpreter (using `python -X importtime`) and fails when a menu imports
+torch, torchvision or the model, or exceeds the startup budget.
+
+Usage (from the faceemotion folder):
+    python app/import_benchmark.py
+    python app/import_benchmark.py --budget 1.0 --runs 5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+MOBILE_APP_DIR = os.path.join(APP_DIR, '..', 'mobile_app')
+ROOT_DIR = os.path.join(APP_DIR, '..', '..')
+
+# Entry point name -> (working directory, code that imports it)
+ENTRY_POINTS = {
+    'desktop app': (APP_DIR, 'import main'),
+    'mobile app': (MOBILE_APP_DIR, 'import main'),
+    'app.py': (ROOT_DIR, 'import app'),
+}
+
+# Must only be imported once an analysis starts
+HEAVY_MODULES = ('torch', 'torchvision', 'monkeypox_model.monkeypox_configuration')
+
+DEFAULT_BUDGET = 1.0
+
+
+def parse_importtime(output):
+    """Return (module, self_us, cumulative_us, depth) rows from -X importtime output"""
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def measure(cwd, code, runs):
+    """Import an entry point in fresh interpreters and summarize the cost"""
+    walls = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', code],
+            cwd=cwd, capture_output=True, text=True,
+        )
+        walls.append(time.perf_counter() - start)
+        if completed.returncode != 0:
+            raise RuntimeError(f"`{code}` failed in {cwd}:\n{completed.stderr[-2000:]}")
+
+    rows = parse_importtime(completed.stderr)
+    modules = {name for name, _, _, _ in rows}
+    top_level = sorted((row for row in rows if row[3] == 1), key=lambda row: row[2], reverse=True)
+    return {
+        'wall_seconds': statistics.median(walls),
+        'import_seconds': sum(row[1] for row in rows) / 1e6,
+        'heavy': [name for name in HEAVY_MODULES if name in modules],
+        'slowest': [(name, cumulative / 1e6) for name, _, cumulative, _ in top_level[:5]],
+    }
+
+
+def main():
+    """Command-line entry point; exits with status 1 on a regression"""
+    parser = argparse.ArgumentParser(description="Benchmark app import time and guard against heavy imports")
+    parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET, help="Maximum seconds per entry point")
+    parser.add_argument('--runs', type=int, default=3, help="Fresh interpreters per entry point (median is used)")
+    args = parser.parse_args()
+
+    failures = []
+    for name, (cwd, code) in ENTRY_POINTS.items():
+        result = measure(os.path.abspath(cwd), code, args.runs)
+        print(f"\n{name}: {result['wall_seconds']:.2f}s wall, {result['import_seconds']:.2f}s importing")
+        for module, seconds in result['slowest']:
+            print(f"    {module:<40} {seconds:6.3f}s")
+        if result['heavy']:
+            failures.append(f"{name} imports {', '.join(result['heavy'])} at startup")
+        if result['wall_seconds'] > args.budget:
+            failures.append(f"{name} took {result['wall_seconds']:.2f}s (budget {args.budget:.2f}s)")
+
+    if failures:
+        print("\n❌ Import-time check failed:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\n✅ All entry points within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,10 +10,11 @@ import sys
 # Add the current directory to the path for imports
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(current_dir)
+sys.path.append(os.path.join(current_dir, '..'))
 
-# Import screen modules
+# Import screen modules; the analysis screens (and torch) are imported on first use
 from screens.main_menu import show_main_menu, show_about, show_collections
-from screens.analyze_screen import show_analyze_screen
+from monkeypox_model.preload import preload_model
 
 def main():
     """Main application function"""
@@ -26,6 +27,9 @@ def main():
         initial_sidebar_state="collapsed"
     )
     
+    # Load and warm up the model in the background while the menu renders
+    preload_model()
+    
     # Initialize session state
     if 'page' not in st.session_state:
         st.session_state.page = "main"
@@ -64,7 +68,11 @@ def main():
     if st.session_state.page == "main":
         show_main_menu()
     elif st.session_state.page == "analyze":
+        from screens.analyze_screen import show_analyze_screen
         show_analyze_screen()
+    elif st.session_state.page == "batch":
+        from screens.batch_screen import show_batch_screen
+        show_batch_screen()
     elif st.session_state.page == "about":
         show_about()
     elif st.session_state.page == "collections":
@@ -4,18 +4,27 @@ Image upload and classification interface
 """
 
 import streamlit as st
-from PIL import Image
 import os
-from datetime import datetime
 import sys
 
 # Add the parent directory to the path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
 try:
-    from monkeypox_model.monkeypox_configuration import MonkeypoxModel
+    from monkeypox_model.registry import get_model
+    from monkeypox_model.inference import InferenceBusyError
+    from monkeypox_model.quality import quality_message
+    from monkeypox_model.uploads import load_upload, predict_upload
 except ImportError:
-    st.error("Could not import MonkeypoxModel. Please check the model configuration.")
+    st.error("Could not import the model registry. Please check the model configuration.")
+
+try:
+    from monkeypox_collections import get_collection_index, get_collection_writer, CollectionBusyError
+except ImportError:
+    st.error("Could not import the collections index. Please check the installation.")
+
+# Longest side of the preview shown in place of the full-resolution upload
+PREVIEW_SIZE = 800
 
 def show_analyze_screen():
     """Display the image analysis screen"""
@@ -28,28 +37,9 @@ def show_analyze_screen():
     
     st.markdown("---")
     
-    # Initialize model
-    @st.cache_resource
-    def load_model():
-        """Load the monkeypox model"""
-        try:
-            model_path = os.path.join(
-                os.path.dirname(__file__), 
-                '..', '..', 
-                'monkeypox_model', 
-                'best_model.pth'
-            )
-            model = MonkeypoxModel()
-            success = model.load_model(model_path)
-            if success:
-                return model
-            else:
-                return None
-        except Exception as e:
-            st.error(f"Error loading model: {e}")
-            return None
-    
-    model = load_model()
+    # Shared model, loaded and warmed up once per process
+    with st.spinner("🤖 Loading model..."):
+        model = get_model()
     
     if model is None:
         st.error("❌ Failed to load the classification model. Please check the model file.")
@@ -66,14 +56,14 @@ def show_analyze_screen():
     if uploaded_file is not None:
         try:
             # Load and display image
-            image = Image.open(uploaded_file).convert("RGB")
+            upload = load_upload(uploaded_file, st.session_state, 'analysis_cache', PREVIEW_SIZE)
             
             # Display image in columns for better layout
             col1, col2 = st.columns([1, 1])
             
             with col1:
                 st.markdown("#### 📷 Uploaded Image")
-                st.image(image, caption="Original Image", use_container_width=True)
+                st.image(upload['preview'], caption="Original Image", use_container_width=True)
             
             with col2:
                 st.markdown("#### 🔍 Analysis Results")
@@ -81,11 +71,20 @@ def show_analyze_screen():
                 # Make prediction
                 with st.spinner("🤖 Analyzing image..."):
                     try:
-                        prediction_result = model.predict(image)
+                        prediction_result = predict_upload(upload)
                         
                         predicted_class = prediction_result['predicted_class']
                         confidence = prediction_result['confidence']
                         probabilities = prediction_result['probabilities']
+                        quality = prediction_result.get('quality')
+                        
+                        # The quality gate rejects unusable photos before the model runs
+                        if predicted_class is None:
+                            st.warning(f"📷 **Image not analyzed**: {quality_message(quality)}")
+                            st.info("Please retake the photo or upload a clearer image.")
+                            return
+                        if quality and quality['status'] == 'warning':
+                            st.info(f"📷 {quality_message(quality)}")
                         
                         # Display results
                         if predicted_class == "Monkey Pox":
@@ -102,6 +101,9 @@ def show_analyze_screen():
                         for class_name, prob in probabilities.items():
                             st.progress(prob, text=f"{class_name}: {prob:.2%}")
                         
+                    except InferenceBusyError as e:
+                        st.warning(f"⏳ {e}")
+                        return
                     except Exception as e:
                         st.error(f"Error during prediction: {e}")
                         return
@@ -136,47 +138,30 @@ def show_analyze_screen():
                 with col2:
                     st.markdown("**Save to Collection**")
                     if st.button("💾 Save Image to Collection", use_container_width=True):
-                        save_image_to_collection(image, save_class, confidence)
+                        save_image_to_collection(upload['data'], save_class, confidence)
         
         except Exception as e:
             st.error(f"Error processing image: {e}")
 
-def save_image_to_collection(image, save_class, confidence):
-    """Save the analyzed image to the appropriate collection folder"""
+def save_image_to_collection(image_bytes, save_class, confidence):
+    """Queue the analyzed image for saving to the appropriate collection folder"""
     try:
-        # Create timestamp
-        now = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # Determine save directory
         base_dir = os.path.join(os.path.dirname(__file__), '..', 'collections')
-        save_dir = os.path.join(base_dir, save_class)
-        
-        # Create directory if it doesn't exist
-        os.makedirs(save_dir, exist_ok=True)
         
-        # Create filename with confidence score
-        confidence_str = f"{confidence:.3f}".replace('.', '')
-        filename = f"{save_class.replace(' ', '_')}_{now}_conf{confidence_str}.jpg"
-        save_path = os.path.join(save_dir, filename)
-        
-        # Save image
-        # Convert to RGB if needed (WebP might have RGBA channels)
-        if image.mode in ('RGBA', 'LA', 'P'):
-            rgb_image = Image.new('RGB', image.size, (255, 255, 255))
-            if image.mode == 'P':
-                image = image.convert('RGBA')
-            rgb_image.paste(image, mask=image.split()[-1] if image.mode in ('RGBA', 'LA') else None)
-            image = rgb_image
-        
-        image.save(save_path, format='JPEG', quality=95)
+        # Encoding and writing happen on the background writer, off the request path
+        get_collection_writer(base_dir).submit(
+            None, save_class, confidence, source='desktop', original_bytes=image_bytes
+        )
         
         # Show success message
-        st.success(f"✅ Image saved successfully!")
-        st.info(f"📁 Saved to: `{save_path}`")
+        st.success(f"✅ Image queued for saving to **{save_class}**!")
         
-        # Show collection stats
+        # The counts only include images the writer has finished storing
         show_collection_stats()
+        st.caption("Counts include an image once it has been written, which may take a moment.")
         
+    except CollectionBusyError as e:
+        st.warning(f"⏳ {e}")
     except Exception as e:
         st.error(f"❌ Error saving image: {e}")
 
@@ -185,11 +170,10 @@ def show_collection_stats():
     try:
         base_dir = os.path.join(os.path.dirname(__file__), '..', 'collections')
         
-        monkey_pox_dir = os.path.join(base_dir, 'Monkey Pox')
-        others_dir = os.path.join(base_dir, 'Others')
-        
-        monkey_pox_count = len([f for f in os.listdir(monkey_pox_dir) if f.endswith(('.jpg', '.jpeg', '.png', '.webp'))]) if os.path.exists(monkey_pox_dir) else 0
-        others_count = len([f for f in os.listdir(others_dir) if f.endswith(('.jpg', '.jpeg', '.png', '.webp'))]) if os.path.exists(others_dir) else 0
+        # Counts come from the collections index instead of listing the folders
+        counts = get_collection_index(base_dir).counts()
+        monkey_pox_count = counts['Monkey Pox']
+        others_count = counts['Others']
         
         st.markdown("**📊 Collection Statistics:**")
         col1, col2, col3 = st.columns(3)
@@ -0,0 +1,200 @@
+"""
+Batch Analysis Screen
+Multi-image upload with batched classification and CSV export
+"""
+
+import streamlit as st
+from concurrent.futures import ThreadPoolExecutor
+import csv
+import hashlib
+import io
+import os
+import sys
+
+# Add the parent directory to the path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+try:
+    from monkeypox_model.registry import get_model
+    from monkeypox_model.inference import get_inference_executor, InferenceBusyError
+    from monkeypox_model.quality import quality_message
+    from monkeypox_model.uploads import decode_image
+except ImportError:
+    st.error("Could not import the model registry. Please check the model configuration.")
+
+# Images decoded and classified per step; the table refreshes after every batch
+BATCH_SIZE = 16
+DECODE_WORKERS = 4
+PAGE_SIZES = (10, 25, 50)
+CSV_COLUMNS = ['File', 'Prediction', 'Confidence', 'Monkey Pox', 'Others', 'Quality', 'Error']
+
+def show_batch_screen():
+    """Display the batch analysis screen"""
+    st.title("🗂️ Batch Image Analysis")
+
+    # Navigation
+    if st.button("🏠 Back to Home"):
+        st.session_state.page = "main"
+        st.rerun()
+
+    st.markdown("---")
+
+    # Shared model, loaded and warmed up once per process
+    with st.spinner("🤖 Loading model..."):
+        model = get_model()
+
+    if model is None:
+        st.error("❌ Failed to load the classification model. Please check the model file.")
+        return
+
+    st.markdown("### 📤 Upload Images")
+    uploaded_files = st.file_uploader(
+        "Choose skin lesion images for analysis",
+        type=["jpg", "jpeg", "png", "webp"],
+        accept_multiple_files=True,
+        help="Select several images at once; they are analyzed together in batches"
+    )
+
+    if not uploaded_files:
+        st.info("Select one or more images to start a batch analysis.")
+        return
+
+    uploads = [
+        (uploaded_file.name, hashlib.sha256(uploaded_file.getvalue()).hexdigest(), uploaded_file)
+        for uploaded_file in uploaded_files
+    ]
+
+    # Results survive reruns (pagination, downloads) keyed by file content;
+    # entries for files no longer selected are dropped
+    previous = st.session_state.get('batch_results', {})
+    cache = {digest: previous[digest] for _, digest, _ in uploads if digest in previous}
+    st.session_state.batch_results = cache
+
+    pending = [(name, digest, uploaded_file.getvalue()) for name, digest, uploaded_file in uploads
+               if digest not in cache]
+    if pending:
+        analyze_uploads(pending, cache, len(uploads))
+
+    show_results([dict(cache[digest], File=name) for name, digest, _ in uploads])
+
+def analyze_uploads(pending, cache, total):
+    """Decode in parallel and classify in batches, updating the table as each batch finishes.
+
+    If the inference workers are busy, the batch stops early; finished
+    results stay cached and the rest are picked up on the next rerun.
+    """
+    executor = get_inference_executor()
+    progress = st.progress(0.0, text="🤖 Analyzing images...")
+    table = st.empty()
+    done_rows = []
+    done = total - len(pending)
+
+    with ThreadPoolExecutor(max_workers=DECODE_WORKERS) as pool:
+        for start in range(0, len(pending), BATCH_SIZE):
+            chunk = pending[start:start + BATCH_SIZE]
+            decoded = list(pool.map(lambda item: _try_decode(item[2]), chunk))
+
+            images = [image for image in decoded if not isinstance(image, Exception)]
+            analysis_error = None
+            try:
+                predictions = iter(executor.predict_batch(images) if images else [])
+            except InferenceBusyError as e:
+                st.warning(f"⏳ {e} Images analyzed so far are kept.")
+                # Any rerun resumes with the images that are still pending
+                st.button("🔄 Continue Analysis")
+                st.stop()
+            except Exception as e:
+                # A model error fails this chunk only; earlier chunks stay in the table
+                analysis_error = e
+
+            for (name, digest, _), image in zip(chunk, decoded):
+                if isinstance(image, Exception):
+                    row = _result_row(error=f"Could not read image: {image}")
+                elif analysis_error is not None:
+                    row = _result_row(error=f"Analysis failed: {analysis_error}")
+                else:
+                    row = _result_row(next(predictions))
+                cache[digest] = row
+                done_rows.append(dict(row, File=name))
+
+            done += len(chunk)
+            progress.progress(done / total, text=f"🤖 Analyzed {done} of {total} images...")
+            table.dataframe(done_rows, column_order=CSV_COLUMNS, hide_index=True, use_container_width=True)
+
+    progress.empty()
+    table.empty()
+
+def _try_decode(data):
+    """Decode an upload, returning the exception instead of raising it"""
+    try:
+        return decode_image(data)
+    except Exception as e:
+        return e
+
+def _result_row(prediction=None, error=""):
+    """Flatten a prediction dict into a table row"""
+    if prediction is None:
+        return {'Prediction': None, 'Confidence': None, 'Monkey Pox': None, 'Others': None, 'Quality': None, 'Error': error}
+    quality = prediction.get('quality')
+    if prediction['predicted_class'] is None:
+        # Rejected by the quality gate; the model did not run
+        return _result_row(error=f"Not analyzed: {quality_message(quality)}")
+    probabilities = prediction['probabilities']
+    return {
+        'Prediction': prediction['predicted_class'],
+        'Confidence': round(prediction['confidence'], 4),
+        'Monkey Pox': round(probabilities['Monkey Pox'], 4),
+        'Others': round(probabilities['Others'], 4),
+        'Quality': quality_message(quality) if quality and quality['issues'] else "OK",
+        'Error': error,
+    }
+
+def show_results(rows):
+    """Display a paginated results table with summary and CSV download"""
+    st.markdown("### 📊 Results")
+
+    flagged = sum(1 for row in rows if row['Prediction'] == "Monkey Pox")
+    failed = sum(1 for row in rows if row['Error'])
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Images", len(rows))
+    col2.metric("Potential Monkeypox", flagged)
+    col3.metric("Unreadable or Rejected", failed)
+
+    if flagged:
+        st.error("⚠️ Some images show signs of potential Monkeypox. Please consult a healthcare professional.")
+
+    page_size = st.selectbox("Rows per page", PAGE_SIZES, key="batch_page_size")
+    page_count = max(1, -(-len(rows) // page_size))
+    page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1, key="batch_page")
+    start = (page - 1) * page_size
+    st.dataframe(
+        rows[start:start + page_size],
+        column_order=CSV_COLUMNS,
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            'Confidence': st.column_config.ProgressColumn(format="%.2f", min_value=0.0, max_value=1.0),
+        },
+    )
+    st.caption(f"Page {page} of {page_count}")
+
+    st.download_button(
+        "📥 Download results as CSV",
+        data=results_csv(rows),
+        file_name="monkeypox_batch_results.csv",
+        mime="text/csv",
+        use_container_width=True,
+    )
+
+    st.warning("""
+    🏥 **MEDICAL DISCLAIMER**: These results are for screening purposes only.
+    Always consult qualified healthcare professionals for diagnosis and treatment.
+    """)
+
+def results_csv(rows):
+    """Serialize result rows to CSV text"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS)
+    writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue()
@@ -4,6 +4,16 @@ Landing page for the Monkeypox Classifier Application
 """
 
 import streamlit as st
+import os
+import sys
+from datetime import date, timedelta
+
+# Add the parent directory to the path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# Thumbnail grid layout for the collections browser
+GRID_COLUMNS = 4
+PAGE_SIZES = (12, 24, 48)
 
 def show_main_menu():
     """Display the main menu screen"""
@@ -50,7 +60,7 @@ def show_main_menu():
     # Navigation buttons
     st.markdown("### 📋 Navigation")
     
-    col1, col2, col3 = st.columns(3)
+    col1, col2, col3, col4 = st.columns(4)
     
     with col1:
         if st.button("🔬 Analyze Image", use_container_width=True):
@@ -58,11 +68,16 @@ def show_main_menu():
             st.rerun()
     
     with col2:
+        if st.button("🗂️ Batch Analysis", use_container_width=True):
+            st.session_state.page = "batch"
+            st.rerun()
+    
+    with col3:
         if st.button("📁 View Collections", use_container_width=True):
             st.session_state.page = "collections"
             st.rerun()
     
-    with col3:
+    with col4:
         if st.button("ℹ️ About", use_container_width=True):
             st.session_state.page = "about"
             st.rerun()
@@ -130,14 +145,79 @@ def show_collections():
     """Display collections management"""
     st.title("📁 Image Collections")
     
+    if st.button("🏠 Back to Home"):
+        st.session_state.page = "main"
+        st.rerun()
+    
     st.markdown("""
     ### Saved Classifications
     View and manage your saved image classifications.
     """)
     
-    # TODO: Add functionality to browse saved images
-    st.info("Collections management feature coming soon!")
+    try:
+        from monkeypox_collections import get_collection_index, get_thumbnail_cache
+    except ImportError:
+        st.error("Could not import the collections index. Please check the installation.")
+        return
+    
+    base_dir = os.path.join(os.path.dirname(__file__), '..', 'collections')
+    index = get_collection_index(base_dir)
+    thumbnails = get_thumbnail_cache(os.path.join(base_dir, '.thumbnails'))
+    
+    # Filters
+    with st.expander("🔎 Filters", expanded=False):
+        class_filter = st.selectbox("Class", ("All", "Monkey Pox", "Others"))
+        confidence_range = st.slider("Confidence", 0.0, 1.0, (0.0, 1.0), step=0.05)
+        date_range = st.date_input("Saved between", value=(), max_value=date.today())
+        page_size = st.selectbox("Images per page", PAGE_SIZES)
+    
+    filters = {}
+    if class_filter != "All":
+        filters['class_name'] = class_filter
+    if confidence_range != (0.0, 1.0):
+        filters['min_confidence'], filters['max_confidence'] = confidence_range
+    if len(date_range) == 2:
+        filters['since'] = date_range[0].isoformat()
+        filters['until'] = (date_range[1] + timedelta(days=1)).isoformat()
+    
+    # Reset to the first page whenever the filters change
+    filter_key = (tuple(sorted(filters.items())), page_size)
+    if st.session_state.get('collections_filter_key') != filter_key:
+        st.session_state.collections_filter_key = filter_key
+        st.session_state.collections_page = 0
+    
+    total = index.count(**filters)
+    if total == 0:
+        st.info("No saved images match these filters yet.")
+        return
+    
+    page_count = (total + page_size - 1) // page_size
+    page = min(st.session_state.get('collections_page', 0), page_count - 1)
+    
+    # Pagination controls
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("⬅️ Previous", disabled=page == 0, use_container_width=True):
+            st.session_state.collections_page = page - 1
+            st.rerun()
+    with col2:
+        st.markdown(f"<p style='text-align: center'>Page {page + 1} of {page_count} · {total} images</p>",
+                    unsafe_allow_html=True)
+    with col3:
+        if st.button("Next ➡️", disabled=page >= page_count - 1, use_container_width=True):
+            st.session_state.collections_page = page + 1
+            st.rerun()
     
-    if st.button("🏠 Back to Home"):
-        st.session_state.page = "main"
-        st.rerun()
+    # Thumbnail grid, one page at a time
+    rows = index.query(limit=page_size, offset=page * page_size, **filters)
+    columns = st.columns(GRID_COLUMNS)
+    for i, row in enumerate(rows):
+        with columns[i % GRID_COLUMNS]:
+            try:
+                thumbnail = thumbnails.get(index.absolute_path(row['path']), row['sha256'])
+            except (FileNotFoundError, OSError):
+                st.warning("Image missing")
+                continue
+            confidence = f"{row['confidence']:.0%}" if row['confidence'] is not None else "n/a"
+            st.image(thumbnail, caption=f"{row['class_name']} · {confidence} · {row['created_at'][:10]}",
+                     use_container_width=True)
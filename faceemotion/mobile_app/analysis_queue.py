@@ -0,0 +1,165 @@
+"""
+Analysis Queue
+Persistent multi-photo queue for the Kivy apps. Photos are analyzed in the
+background in small batches, each result is posted to the UI as soon as
+its batch finishes, and the queue is saved to disk after every change so
+unfinished work resumes after the app restarts.
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+
+from capture import load_capture
+
+BATCH_SIZE = 4
+# Finished items kept in the saved queue; older ones are dropped
+MAX_FINISHED = 200
+
+
+class AnalysisQueue:
+    """Background queue of photos to classify.
+
+    post:       callable that runs a function on the UI thread
+    on_update:  called with the item dict on the UI thread whenever an item finishes
+    on_drained: called on the UI thread, after the last on_update, once no
+                pending items are left
+
+    Items are dicts with 'id', 'path', 'status' ('pending', 'done' or
+    'failed'), 'added_at', and 'result' or 'error' once finished. Nothing is
+    analyzed until a model is given with set_model().
+    """
+
+    def __init__(self, queue_dir, post, on_update=None, on_drained=None, batch_size=BATCH_SIZE):
+        self.state_path = os.path.join(queue_dir, 'analysis_queue.json')
+        self.batch_size = batch_size
+        self._post = post
+        self._on_update = on_update
+        self._on_drained = on_drained
+        self._condition = threading.Condition()
+        self._model = None
+        self._stopped = False
+        os.makedirs(queue_dir, exist_ok=True)
+        self._items = self._load()
+        self._thread = threading.Thread(target=self._run, name="analysis-queue", daemon=True)
+        self._thread.start()
+
+    def add(self, paths):
+        """Queue image paths for analysis and return the new items"""
+        now = time.time()
+        items = [
+            {'id': uuid.uuid4().hex, 'path': path, 'status': 'pending', 'added_at': now}
+            for path in paths
+        ]
+        with self._condition:
+            self._items.extend(items)
+            self._save()
+            self._condition.notify()
+        return items
+
+    def items(self):
+        """Return a snapshot of all items, oldest first"""
+        with self._condition:
+            return [dict(item) for item in self._items]
+
+    def counts(self):
+        """Return the number of items per status"""
+        counts = {'pending': 0, 'done': 0, 'failed': 0}
+        with self._condition:
+            for item in self._items:
+                counts[item['status']] += 1
+        return counts
+
+    def clear_finished(self):
+        """Remove done and failed items"""
+        with self._condition:
+            self._items = [item for item in self._items if item['status'] == 'pending']
+            self._save()
+
+    def set_model(self, model):
+        """Start analyzing with the loaded model"""
+        with self._condition:
+            self._model = model
+            self._condition.notify()
+
+    def stop(self):
+        """Stop after the current batch; pending items stay saved"""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+
+    def _load(self):
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)['items']
+        except (OSError, ValueError, KeyError):
+            return []
+
+    def _save(self):
+        # Called with the lock held; atomic so a crash never leaves half a file
+        finished = [item for item in self._items if item['status'] != 'pending']
+        if len(finished) > MAX_FINISHED:
+            dropped = {item['id'] for item in finished[:-MAX_FINISHED]}
+            self._items = [item for item in self._items if item['id'] not in dropped]
+        tmp_path = self.state_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'items': self._items}, f)
+        os.replace(tmp_path, self.state_path)
+
+    def _next_batch(self):
+        with self._condition:
+            while not self._stopped and (
+                self._model is None or not any(item['status'] == 'pending' for item in self._items)
+            ):
+                self._condition.wait()
+            if self._stopped:
+                return None, []
+            batch = [item for item in self._items if item['status'] == 'pending'][:self.batch_size]
+            return self._model, batch
+
+    def _analyze(self, model, batch):
+        """Return (item, result, error) for each item of a batch"""
+        images, outcomes = [], []
+        for item in batch:
+            try:
+                images.append(load_capture(item['path']))
+                outcomes.append([item, None, None])
+            except Exception as e:
+                outcomes.append([item, None, f"Could not open image: {e}"])
+
+        loaded = [outcome for outcome in outcomes if outcome[2] is None]
+        if loaded:
+            try:
+                results = model.predict_batch(images, batch_size=self.batch_size)
+            except Exception as e:
+                for outcome in loaded:
+                    outcome[2] = str(e)
+            else:
+                for outcome, result in zip(loaded, results):
+                    outcome[1] = result
+        return outcomes
+
+    def _run(self):
+        while True:
+            model, batch = self._next_batch()
+            if model is None:
+                return
+
+            outcomes = self._analyze(model, batch)
+            with self._condition:
+                for item, result, error in outcomes:
+                    if error is None:
+                        item.update(status='done', result=result)
+                    else:
+                        item.update(status='failed', error=error)
+                self._save()
+                finished = [dict(item) for item, _, _ in outcomes]
+                drained = not any(item['status'] == 'pending' for item in self._items)
+
+            if self._on_update is not None:
+                for item in finished:
+                    self._post(lambda item=item: self._on_update(item))
+            if drained and self._on_drained is not None:
+                self._post(self._on_drained)
@@ -0,0 +1,150 @@
+"""
+Analysis Worker
+Background threads for the Kivy apps: model loading and inference run off
+the UI thread and post their results back to it, so the interface appears
+immediately and keeps drawing while the model loads or an image is analyzed.
+"""
+
+import threading
+import time
+
+
+class AnalysisWorker:
+    """Single background thread with a job queue and stale-job cancellation.
+
+    post:  callable that runs a function on the UI thread, e.g.
+           lambda fn: Clock.schedule_once(lambda dt: fn(), 0)
+
+    Submitting a job with replace=True drops every job still waiting, and
+    a job that was already running when it became stale has its result
+    discarded instead of delivered.
+    """
+
+    def __init__(self, post):
+        self._post = post
+        self._condition = threading.Condition()
+        self._jobs = []
+        self._generation = 0
+        self._running = False
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="analysis-worker", daemon=True)
+        self._thread.start()
+
+    def submit(self, work, on_result, on_error=None, replace=True):
+        """Queue work() to run in the background and return the job's generation.
+
+        on_result(value) or on_error(exception) is called on the UI thread.
+        """
+        with self._condition:
+            if replace:
+                self._generation += 1
+                self._jobs.clear()
+            self._jobs.append((self._generation, work, on_result, on_error))
+            self._condition.notify()
+            return self._generation
+
+    def cancel(self):
+        """Drop waiting jobs and discard the result of the running one"""
+        with self._condition:
+            self._generation += 1
+            self._jobs.clear()
+
+    @property
+    def busy(self):
+        """True while any job is waiting or running"""
+        with self._condition:
+            return bool(self._jobs) or self._running
+
+    def stop(self):
+        """Stop the worker thread after the current job"""
+        with self._condition:
+            self._stopped = True
+            self._jobs.clear()
+            self._condition.notify()
+
+    def _deliver(self, generation, callback, value):
+        # Checked on the UI thread too, in case the job went stale after posting
+        with self._condition:
+            current = generation == self._generation and not self._stopped
+        if current:
+            callback(value)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._jobs and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                generation, work, on_result, on_error = self._jobs.pop(0)
+                self._running = True
+
+            try:
+                value = work()
+            except Exception as e:
+                if on_error is not None:
+                    self._post(lambda g=generation, cb=on_error, e=e: self._deliver(g, cb, e))
+            else:
+                self._post(lambda g=generation, cb=on_result, v=value: self._deliver(g, cb, v))
+            finally:
+                with self._condition:
+                    self._running = False
+
+
+class ModelLoader:
+    """Loads the model on a background thread as soon as it is started.
+
+    load:        callable(report) returning the model; report(message) posts progress
+    post:        callable that runs a function on the UI thread
+    on_progress: called with each progress message on the UI thread
+    on_ready:    called with the model on the UI thread
+    on_error:    called with the exception on the UI thread
+
+    `load_seconds` holds the loading time once finished.
+    """
+
+    def __init__(self, load, post, on_progress=None, on_ready=None, on_error=None):
+        self._load = load
+        self._post = post
+        self._on_progress = on_progress
+        self._on_ready = on_ready
+        self._on_error = on_error
+        self.state = 'idle'
+        self.load_seconds = None
+        self._thread = threading.Thread(target=self._run, name="model-loader", daemon=True)
+
+    @property
+    def ready(self):
+        """True once the model has loaded successfully"""
+        return self.state == 'ready'
+
+    def start(self):
+        """Start loading; call once"""
+        self.state = 'loading'
+        self._thread.start()
+
+    def _report(self, message):
+        if self._on_progress is not None:
+            self._post(lambda: self._on_progress(message))
+
+    def _run(self):
+        start = time.perf_counter()
+        model, error = None, None
+        try:
+            model = self._load(self._report)
+        except Exception as e:
+            error = e
+        seconds = time.perf_counter() - start
+        self._post(lambda: self._finish(model, error, seconds))
+
+    def _finish(self, model, error, seconds):
+        # Runs on the UI thread, so state changes never race with UI callbacks
+        self.load_seconds = seconds
+        if error is None:
+            self.state = 'ready'
+            if self._on_ready is not None:
+                self._on_ready(model)
+        else:
+            self.state = 'failed'
+            if self._on_error is not None:
+                self._on_error(error)
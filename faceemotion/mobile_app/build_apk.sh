@@ -27,6 +27,11 @@ mkdir -p ../monkeypox_model
 cp ../../monkeypox_model/*.py ../monkeypox_model/
 cp ../../monkeypox_model/*.pth ../monkeypox_model/ 2>/dev/null || echo "⚠️  Model file (best_model.pth) not found - app will run without AI"
 
+# Build the compact int8 model (needs calibration images from the training set)
+echo "📦 Exporting mobile model..."
+(cd .. && python -m monkeypox_model.mobile_export --calibration ../monkeypox_data/train) \
+    || echo "⚠️  Mobile model export failed - app will load the full model instead"
+
 # Initialize buildozer if not already done
 if [ ! -f "buildozer.spec" ]; then
     echo "🔧 Initializing buildozer..."
@@ -0,0 +1,24 @@
+"""
+Capture Loading
+Opens camera and gallery photos at close to the model's input size. JPEG
+files are downscaled while decoding, so a 12-48 MP photo never exists in
+memory at full resolution.
+"""
+
+from PIL import Image
+
+from monkeypox_model.imaging import flatten_to_rgb
+
+# Same as MonkeypoxConfig.IMAGE_SIZE (height, width); kept here to avoid importing torch
+MODEL_INPUT_SIZE = (224, 224)
+
+
+def load_capture(image_path, size=MODEL_INPUT_SIZE):
+    """Return the photo at image_path resized to the model input size"""
+    with Image.open(image_path) as image:
+        # Picks the largest DCT scale (1/2, 1/4, 1/8) that stays at or above size;
+        # a no-op for formats other than JPEG
+        image.draft('RGB', (size[1], size[0]))
+        # Flatten before resizing: PIL only resizes palette images with NEAREST.
+        # Resizing here drops the decoded photo as soon as the file is closed
+        return flatten_to_rgb(image).resize((size[1], size[0]), Image.BILINEAR)
@@ -6,9 +6,13 @@ Can also run as Streamlit PWA
 
 import os
 import sys
+import time
 import traceback
 from datetime import datetime
 
+# Reference point for cold-start timing
+APP_START = time.perf_counter()
+
 # Set up paths
 APP_DIR = os.path.dirname(os.path.abspath(__file__))
 MODEL_DIR = os.path.join(APP_DIR, 'model')
@@ -58,21 +62,27 @@ else:
     # Add the current directory to the path for imports
     current_dir = os.path.dirname(os.path.abspath(__file__))
     sys.path.append(current_dir)
+    sys.path.append(os.path.join(current_dir, '..'))
     
-    # Import screen modules
+    # Import screen modules; the analysis screens (and torch) are imported on first use
     from screens.mobile_main_menu import show_mobile_main_menu, show_mobile_about
-    from screens.mobile_analyze_screen import show_mobile_analyze_screen
-
-# Model import
-try:
-    from monkeypox_model.monkeypox_configuration import MonkeypoxModel
-    MODEL_AVAILABLE = True
-except ImportError as e:
-    MODEL_AVAILABLE = False
-    if RUNNING_AS_APK:
-        Logger.warning(f"MonkeypoxModel import failed: {e}")
+    from monkeypox_model.preload import preload_model
 
 if RUNNING_AS_APK:
+    # The model package sits next to the app folder, as for native_app.py
+    sys.path.append(os.path.join(APP_DIR, '..'))
+    
+    # Background model loading and inference; the model (and torch) is
+    # imported on the loader thread so the first frame does not wait for it
+    from analysis_worker import AnalysisWorker, ModelLoader
+    from capture import load_capture
+    from analysis_queue import AnalysisQueue
+    
+    def quality_message(quality):
+        """Describe why a photo failed the quality gate"""
+        from monkeypox_model.quality import quality_message
+        return quality_message(quality)
+    
     # Kivy APK Application Class
     class MonkeypoxAPK(App):
         """Native Android APK for Monkeypox Classification"""
@@ -82,14 +92,31 @@ if RUNNING_AS_APK:
             self.model = None
             self.current_image_path = None
             self.result_popup = None
+            self.analysis_pending = False
+            self.analysis_queue = None
+            self.cold_start = {}
+            # Inference runs off the UI thread; results come back through the Clock
+            self.post_to_ui = lambda fn: Clock.schedule_once(lambda dt: fn(), 0)
+            self.analysis_worker = AnalysisWorker(self.post_to_ui)
+            self.model_loader = ModelLoader(
+                self.load_model, self.post_to_ui,
+                on_progress=self.model_progress,
+                on_ready=self.model_ready,
+                on_error=self.model_failed
+            )
             
         def build(self):
             """Build the mobile app interface"""
             self.title = "Monkeypox AI Classifier"
             
-            # Load AI model
-            if MODEL_AVAILABLE:
-                self.load_model()
+            # Load AI model in the background so the first frame does not wait for it
+            self.model_loader.start()
+            # Camera photos and gallery picks of several images are analyzed in
+            # the background; the queue resumes after restarts
+            self.analysis_queue = AnalysisQueue(
+                os.path.join(self.user_data_dir, 'queue'), self.post_to_ui,
+                on_update=self.queue_item_finished, on_drained=self.show_queue_results
+            )
             
             # Main layout
             main_layout = BoxLayout(
@@ -129,7 +156,7 @@ if RUNNING_AS_APK:
             camera_button.bind(on_press=self.take_photo)
             
             gallery_button = Button(
-                text='📁 Choose from Gallery',
+                text='📁 Choose from Gallery (one or more)',
                 size_hint_y=None,
                 height=60,
                 font_size='18sp',
@@ -157,7 +184,7 @@ if RUNNING_AS_APK:
             
             # Status label
             self.status_label = Label(
-                text='Ready for image analysis',
+                text='⏳ Loading AI model...',
                 size_hint_y=None,
                 height=40,
                 font_size='14sp'
@@ -174,32 +201,72 @@ if RUNNING_AS_APK:
             
             return main_layout
         
-        def load_model(self):
-            """Load the AI classification model"""
-            try:
-                model_path = os.path.join(
-                    os.path.dirname(__file__), 
-                    '..', 
-                    'monkeypox_model', 
-                    'best_model.pth'
+        def on_start(self):
+            """Record when the first frame is drawn"""
+            Clock.schedule_once(self.first_frame_drawn, 0)
+        
+        def first_frame_drawn(self, dt):
+            """Store time-to-first-frame for the cold-start report"""
+            self.cold_start['first_frame_seconds'] = time.perf_counter() - APP_START
+            self.log_cold_start()
+        
+        def load_model(self, report):
+            """Load the AI classification model (runs on the loader thread)"""
+            model_dir = os.path.join(os.path.dirname(__file__), '..', 'monkeypox_model')
+            
+            # The compact exported model loads without torchvision
+            mobile_model_path = os.path.join(model_dir, 'mobile_model.pt')
+            if os.path.exists(mobile_model_path):
+                report("⏳ Loading AI model...")
+                from monkeypox_model.mobile_runtime import load_mobile_model
+                return load_mobile_model(mobile_model_path)
+            
+            model_path = os.path.join(model_dir, 'best_model.pth')
+            if not os.path.exists(model_path):
+                raise FileNotFoundError(f"Model file not found at {model_path}")
+            
+            report("⏳ Loading AI libraries...")
+            from monkeypox_model.registry import get_model
+            
+            report("⏳ Loading AI model...")
+            model = get_model(model_path)
+            if model is None:
+                raise RuntimeError("Failed to load AI model")
+            return model
+        
+        def model_progress(self, message):
+            """Show model loading progress"""
+            self.status_label.text = message
+        
+        def model_ready(self, model):
+            """Use the loaded model and run an analysis requested while loading"""
+            self.model = model
+            self.status_label.text = "AI Model loaded successfully"
+            Logger.info("MonkeypoxAPK: Model loaded successfully")
+            self.cold_start['model_ready_seconds'] = time.perf_counter() - APP_START
+            self.cold_start['model_load_seconds'] = self.model_loader.load_seconds
+            self.log_cold_start()
+            self.analysis_queue.set_model(model)
+            
+            if self.analysis_pending:
+                self.analysis_pending = False
+                self.analyze_image()
+        
+        def model_failed(self, error):
+            """Report a model loading failure"""
+            self.status_label.text = f"Model loading error: {str(error)}"
+            Logger.error(f"MonkeypoxAPK: Model loading error: {error}")
+            if self.analysis_pending:
+                self.analysis_pending = False
+                self.show_popup("Model Error", "AI model not available. Please check installation.")
+        
+        def log_cold_start(self):
+            """Log cold-start timing once both milestones are known"""
+            if 'first_frame_seconds' in self.cold_start and 'model_ready_seconds' in self.cold_start:
+                Logger.info(
+                    "MonkeypoxAPK: Cold start - first frame {first_frame_seconds:.2f}s, "
+                    "model ready {model_ready_seconds:.2f}s (load {model_load_seconds:.2f}s)".format(**self.cold_start)
                 )
-                
-                if os.path.exists(model_path):
-                    self.model = MonkeypoxModel()
-                    success = self.model.load_model(model_path)
-                    if success:
-                        self.status_label.text = "AI Model loaded successfully"
-                        Logger.info("MonkeypoxAPK: Model loaded successfully")
-                    else:
-                        self.status_label.text = "Failed to load AI model"
-                        Logger.error("MonkeypoxAPK: Failed to load model")
-                else:
-                    self.status_label.text = "Model file not found"
-                    Logger.error(f"MonkeypoxAPK: Model file not found at {model_path}")
-                    
-            except Exception as e:
-                self.status_label.text = f"Model loading error: {str(e)}"
-                Logger.error(f"MonkeypoxAPK: Model loading error: {e}")
         
         def take_photo(self, instance):
             """Take photo using device camera"""
@@ -226,11 +293,14 @@ if RUNNING_AS_APK:
                 self.show_popup("Camera Error", f"Failed to access camera: {str(e)}")
         
         def photo_taken(self, filename):
-            """Handle photo taken from camera"""
+            """Queue a photo taken with the camera (may be called off the UI thread)"""
+            self.post_to_ui(lambda: self.queue_photo(filename))
+        
+        def queue_photo(self, filename):
+            """Add a captured photo to the queue, so several can be taken in a row"""
             if filename and os.path.exists(filename):
-                self.current_image_path = filename
-                self.status_label.text = f"Photo captured: {os.path.basename(filename)}"
-                Clock.schedule_once(lambda dt: self.analyze_image(), 0.5)
+                self.analysis_queue.add([filename])
+                self.refresh_queue_status()
             else:
                 self.show_popup("Photo Error", "Failed to capture photo. Please try again.")
         
@@ -248,7 +318,8 @@ if RUNNING_AS_APK:
                 
                 filechooser = FileChooserIconView(
                     path=start_path,
-                    filters=['*.jpg', '*.jpeg', '*.png', '*.webp']
+                    filters=['*.jpg', '*.jpeg', '*.png', '*.webp'],
+                    multiselect=True
                 )
                 
                 button_layout = BoxLayout(
@@ -261,7 +332,11 @@ if RUNNING_AS_APK:
                 cancel_button = Button(text='Cancel')
                 
                 def select_image(btn):
-                    if filechooser.selection:
+                    if len(filechooser.selection) > 1:
+                        popup.dismiss()
+                        self.analysis_queue.add(filechooser.selection)
+                        self.refresh_queue_status()
+                    elif filechooser.selection:
                         self.current_image_path = filechooser.selection[0]
                         self.status_label.text = f"Selected: {os.path.basename(self.current_image_path)}"
                         popup.dismiss()
@@ -298,25 +373,94 @@ if RUNNING_AS_APK:
                 return
             
             if not self.model:
-                self.show_popup("Model Error", "AI model not available. Please check installation.")
+                if self.model_loader.state == 'failed':
+                    self.show_popup("Model Error", "AI model not available. Please check installation.")
+                    return
+                # Analyze the current image as soon as loading finishes
+                self.analysis_pending = True
+                self.status_label.text = "⏳ Waiting for AI model..."
                 return
             
-            try:
-                self.status_label.text = "Analyzing image..."
-                
-                # Perform AI analysis
-                result = self.model.predict(self.current_image_path)
-                
-                predicted_class = result['predicted_class']
-                confidence = result['confidence']
-                
-                # Show results
-                self.show_analysis_results(predicted_class, confidence)
-                
-            except Exception as e:
-                self.show_popup("Analysis Error", f"Failed to analyze image: {str(e)}")
-                Logger.error(f"MonkeypoxAPK: Analysis error: {e}")
-                Logger.error(f"MonkeypoxAPK: Traceback: {traceback.format_exc()}")
+            self.status_label.text = "Analyzing image..."
+            
+            # Perform AI analysis in the background; a newer image replaces this one
+            model = self.model
+            image_path = self.current_image_path
+            
+            def analyze():
+                try:
+                    # Decode at reduced size; full-resolution photos exhaust phone memory
+                    return model.predict(load_capture(image_path))
+                except Exception:
+                    Logger.error(f"MonkeypoxAPK: Traceback: {traceback.format_exc()}")
+                    raise
+            
+            self.analysis_worker.submit(analyze, on_result=self.analysis_finished, on_error=self.analysis_failed)
+        
+        def queue_item_finished(self, item):
+            """Show each queued photo's result as soon as it is analyzed"""
+            name = os.path.basename(item['path'])
+            if item['status'] == 'done' and item['result']['predicted_class'] is None:
+                Logger.info(f"MonkeypoxAPK: Queued {name} not analyzed: {quality_message(item['result']['quality'])}")
+            elif item['status'] == 'done':
+                Logger.info(f"MonkeypoxAPK: Queued {name}: {item['result']['predicted_class']} ({item['result']['confidence']:.1%})")
+            else:
+                Logger.warning(f"MonkeypoxAPK: Queued {name} failed: {item['error']}")
+            self.refresh_queue_status()
+        
+        def refresh_queue_status(self):
+            """Summarize queue progress in the status line"""
+            counts = self.analysis_queue.counts()
+            if counts['pending']:
+                self.status_label.text = f"Analyzing photos: {counts['done'] + counts['failed']} done, {counts['pending']} waiting"
+        
+        def show_queue_results(self):
+            """Show the results once the queue has no photos left to analyze"""
+            items = [item for item in self.analysis_queue.items() if item['status'] != 'pending']
+            if not items:
+                return
+            self.analysis_queue.clear_finished()
+            if len(items) == 1:
+                # A single photo gets the same result popup as a direct analysis
+                item = items[0]
+                if item['status'] == 'done':
+                    self.analysis_finished(item['result'])
+                else:
+                    self.analysis_failed(item['error'])
+                return
+            
+            self.status_label.text = f"Photo queue finished ({len(items)} photos)"
+            lines = []
+            for item in items[-10:]:
+                name = os.path.basename(item['path'])
+                if item['status'] == 'done' and item['result']['predicted_class'] is None:
+                    lines.append(f"{name}: retake ({quality_message(item['result']['quality'])})")
+                elif item['status'] == 'done':
+                    lines.append(f"{name}: {item['result']['predicted_class']} ({item['result']['confidence']:.0%})")
+                else:
+                    lines.append(f"{name}: failed")
+            self.show_popup("Photo Queue Results", "\n".join(lines))
+        
+        def analysis_finished(self, result):
+            """Show the result reported by the worker thread"""
+            if result['predicted_class'] is None:
+                # Rejected by the quality gate before the model ran
+                self.status_label.text = "Photo quality too low"
+                self.show_popup("Please Retake Photo", f"This photo could not be analyzed:\n{quality_message(result['quality'])}")
+                return
+            self.show_analysis_results(result['predicted_class'], result['confidence'])
+        
+        def analysis_failed(self, error):
+            """Report an analysis error from the worker thread"""
+            self.status_label.text = "Analysis failed"
+            self.show_popup("Analysis Error", f"Failed to analyze image: {str(error)}")
+            Logger.error(f"MonkeypoxAPK: Analysis error: {error}")
+        
+        def on_stop(self):
+            """Stop the background workers when the app closes"""
+            self.analysis_worker.stop()
+            if self.analysis_queue:
+                self.analysis_queue.stop()
         
         def show_analysis_results(self, predicted_class, confidence):
             """Display analysis results"""
@@ -556,7 +700,11 @@ else:
         if st.session_state.page == "main":
             show_mobile_main_menu()
         elif st.session_state.page == "analyze":
+            from screens.mobile_analyze_screen import show_mobile_analyze_screen
             show_mobile_analyze_screen()
+        elif st.session_state.page == "live":
+            from screens.mobile_live_screen import show_mobile_live_screen
+            show_mobile_live_screen()
         elif st.session_state.page == "about":
             show_mobile_about()
         else:
@@ -591,6 +739,9 @@ def main():
             }
         )
         
+        # Load and warm up the model in the background while the menu renders
+        preload_model()
+        
         # Initialize session state
         if 'page' not in st.session_state:
             st.session_state.page = "main"
@@ -703,7 +854,11 @@ def main():
         if st.session_state.page == "main":
             show_mobile_main_menu()
         elif st.session_state.page == "analyze":
+            from screens.mobile_analyze_screen import show_mobile_analyze_screen
             show_mobile_analyze_screen()
+        elif st.session_state.page == "live":
+            from screens.mobile_live_screen import show_mobile_live_screen
+            show_mobile_live_screen()
         elif st.session_state.page == "about":
             show_mobile_about()
         else:
@@ -3,6 +3,11 @@ Native Mobile App using Kivy/KivyMD
 Alternative native mobile implementation
 """
 
+import time
+
+# Reference point for cold-start timing
+APP_START = time.perf_counter()
+
 from kivymd.app import MDApp
 from kivymd.uix.screen import MDScreen
 from kivymd.uix.button import MDRaisedButton, MDIconButton
@@ -20,10 +25,12 @@ from datetime import datetime
 # Add model path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-try:
-    from monkeypox_model.monkeypox_configuration import MonkeypoxModel
-except ImportError:
-    Logger.warning("MonkeypoxModel: Could not import model")
+# The model (and torch) is imported on the loader thread, not here
+from analysis_worker import AnalysisWorker, ModelLoader
+from capture import load_capture
+from result_history import ResultHistory
+from analysis_queue import AnalysisQueue
+from monkeypox_model.quality import quality_message
 
 class MonkeypoxMobileApp(MDApp):
     """Native mobile app for Monkeypox classification"""
@@ -34,14 +41,36 @@ class MonkeypoxMobileApp(MDApp):
         self.file_manager = None
         self.model = None
         self.dialog = None
+        self.pending_image_path = None
+        self.analyzed_image_path = None
+        self.last_result = None
+        self.history = None
+        self.analysis_queue = None
+        self.queue_dialog = None
+        self.cold_start = {}
+        # Inference runs off the UI thread; results come back through the Clock
+        self.post_to_ui = lambda fn: Clock.schedule_once(lambda dt: fn(), 0)
+        self.analysis_worker = AnalysisWorker(self.post_to_ui)
+        self.model_loader = ModelLoader(
+            self.load_classification_model, self.post_to_ui,
+            on_progress=self.model_progress,
+            on_ready=self.model_ready,
+            on_error=self.model_failed
+        )
         
     def build(self):
         """Build the mobile app interface"""
         self.theme_cls.theme_style = "Light"
         self.theme_cls.primary_palette = "Red"
         
-        # Load model
-        self.load_classification_model()
+        # Load the model in the background so the first frame does not wait for it
+        self.model_loader.start()
+        self.history = ResultHistory(os.path.join(self.user_data_dir, 'history'))
+        # Resumes photos left unanalyzed when the app last closed
+        self.analysis_queue = AnalysisQueue(
+            os.path.join(self.user_data_dir, 'queue'), self.post_to_ui,
+            on_update=self.queue_item_finished
+        )
         
         # Create main layout
         main_layout = MDBoxLayout(
@@ -85,6 +114,22 @@ class MonkeypoxMobileApp(MDApp):
             on_release=self.show_medical_info
         )
         
+        queue_button = MDRaisedButton(
+            text="🗂️ Analyze Multiple Photos",
+            size_hint_y=None,
+            height=50,
+            md_bg_color=(0.6, 0.2, 0.2, 1),
+            on_release=self.show_queue
+        )
+        
+        history_button = MDRaisedButton(
+            text="📜 Saved Results",
+            size_hint_y=None,
+            height=50,
+            md_bg_color=(0.4, 0.4, 0.4, 1),
+            on_release=self.show_history
+        )
+        
         emergency_button = MDRaisedButton(
             text="🚨 Emergency Contacts",
             size_hint_y=None,
@@ -93,30 +138,92 @@ class MonkeypoxMobileApp(MDApp):
             on_release=self.show_emergency_contacts
         )
         
+        # Model loading progress
+        self.status_label = MDLabel(
+            text="⏳ Loading AI model...",
+            halign="center",
+            size_hint_y=None,
+            height=40
+        )
+        
         # Add to layout
         main_layout.add_widget(header_card)
+        main_layout.add_widget(self.status_label)
         main_layout.add_widget(analyze_button)
+        main_layout.add_widget(queue_button)
         main_layout.add_widget(info_button)
+        main_layout.add_widget(history_button)
         main_layout.add_widget(emergency_button)
         
         self.screen.add_widget(main_layout)
         return self.screen
     
-    def load_classification_model(self):
-        """Load the monkeypox classification model"""
-        try:
-            model_path = os.path.join(
-                os.path.dirname(__file__), 
-                '..', 
-                'monkeypox_model', 
-                'best_model.pth'
+    def on_start(self):
+        """Record when the first frame is drawn"""
+        Clock.schedule_once(self.first_frame_drawn, 0)
+    
+    def first_frame_drawn(self, dt):
+        """Store time-to-first-frame for the cold-start report"""
+        self.cold_start['first_frame_seconds'] = time.perf_counter() - APP_START
+        self.log_cold_start()
+    
+    def load_classification_model(self, report):
+        """Load the monkeypox classification model (runs on the loader thread)"""
+        model_dir = os.path.join(os.path.dirname(__file__), '..', 'monkeypox_model')
+        
+        # The compact exported model loads without torchvision
+        mobile_model_path = os.path.join(model_dir, 'mobile_model.pt')
+        if os.path.exists(mobile_model_path):
+            report("⏳ Loading AI model...")
+            from monkeypox_model.mobile_runtime import load_mobile_model
+            return load_mobile_model(mobile_model_path)
+        
+        report("⏳ Loading AI libraries...")
+        from monkeypox_model.registry import get_model
+        
+        model_path = os.path.join(model_dir, 'best_model.pth')
+        report("⏳ Loading AI model...")
+        model = get_model(model_path)
+        if model is None:
+            raise RuntimeError(f"Failed to load model from {model_path}")
+        return model
+    
+    def model_progress(self, message):
+        """Show model loading progress"""
+        self.status_label.text = message
+    
+    def model_ready(self, model):
+        """Use the loaded model and run any analysis requested while loading"""
+        self.model = model
+        self.status_label.text = "✅ AI model ready"
+        self.cold_start['model_ready_seconds'] = time.perf_counter() - APP_START
+        self.cold_start['model_load_seconds'] = self.model_loader.load_seconds
+        self.log_cold_start()
+        self.analysis_queue.set_model(model)
+        
+        if self.pending_image_path:
+            image_path, self.pending_image_path = self.pending_image_path, None
+            if self.dialog:
+                self.dialog.dismiss()
+            self.perform_analysis(image_path)
+    
+    def model_failed(self, error):
+        """Report a model loading failure"""
+        Logger.error(f"MonkeypoxApp: Error loading model: {error}")
+        self.status_label.text = "❌ AI model failed to load"
+        if self.pending_image_path:
+            self.pending_image_path = None
+            if self.dialog:
+                self.dialog.dismiss()
+            self.show_error_dialog("AI model not loaded")
+    
+    def log_cold_start(self):
+        """Log cold-start timing once both milestones are known"""
+        if 'first_frame_seconds' in self.cold_start and 'model_ready_seconds' in self.cold_start:
+            Logger.info(
+                "MonkeypoxApp: Cold start - first frame {first_frame_seconds:.2f}s, "
+                "model ready {model_ready_seconds:.2f}s (load {model_load_seconds:.2f}s)".format(**self.cold_start)
             )
-            self.model = MonkeypoxModel()
-            success = self.model.load_model(model_path)
-            if not success:
-                Logger.error("MonkeypoxApp: Failed to load model")
-        except Exception as e:
-            Logger.error(f"MonkeypoxApp: Error loading model: {e}")
     
     def open_camera_or_gallery(self, instance):
         """Open camera or file picker for image selection"""
@@ -190,30 +297,57 @@ class MonkeypoxMobileApp(MDApp):
     def perform_analysis(self, image_path):
         """Perform AI analysis on the selected image"""
         if not self.model:
-            self.show_error_dialog("AI model not loaded")
+            if self.model_loader.state == 'failed':
+                self.show_error_dialog("AI model not loaded")
+                return
+            # Analyze as soon as loading finishes; only the latest image is kept
+            self.pending_image_path = image_path
+            self.show_loading_dialog("Preparing AI model...")
             return
         
         try:
             # Show loading dialog
             self.show_loading_dialog("Analyzing image...")
             
-            # Perform prediction
-            def analyze():
-                result = self.model.predict(image_path)
-                Clock.schedule_once(lambda dt: self.show_results(result), 0)
-            
-            # Run analysis in background
-            Clock.schedule_once(lambda dt: analyze(), 0.1)
+            # Run prediction on the worker thread at reduced decode size; a newer
+            # analysis replaces this one
+            model = self.model
+            self.analyzed_image_path = image_path
+            self.analysis_worker.submit(
+                lambda: model.predict(load_capture(image_path)),
+                on_result=self.show_results,
+                on_error=self.analysis_failed
+            )
             
         except Exception as e:
             self.show_error_dialog(f"Analysis error: {str(e)}")
     
+    def analysis_failed(self, error):
+        """Handle an analysis error reported by the worker thread"""
+        if self.dialog:
+            self.dialog.dismiss()
+        Logger.error(f"MonkeypoxApp: Analysis error: {error}")
+        self.show_error_dialog(f"Analysis error: {str(error)}")
+    
+    def cancel_analysis(self, instance):
+        """Cancel the running analysis and close the loading dialog"""
+        self.pending_image_path = None
+        self.analysis_worker.cancel()
+        self.close_dialog(instance)
+    
     def show_results(self, result):
         """Display analysis results"""
         # Close loading dialog
         if self.dialog:
             self.dialog.dismiss()
         
+        # Rejected by the quality gate: ask for a better photo instead
+        if result['predicted_class'] is None:
+            self.last_result = None
+            self.show_retake_dialog(result['quality'])
+            return
+        
+        self.last_result = result
         predicted_class = result['predicted_class']
         confidence = result['confidence']
         
@@ -273,6 +407,130 @@ Monitor for:
         )
         self.dialog.open()
     
+    def show_queue(self, instance):
+        """Show the multi-photo queue and its results so far"""
+        self.queue_dialog = MDDialog(
+            title="Photo Queue",
+            text=self.queue_summary(),
+            buttons=[
+                MDRaisedButton(
+                    text="📁 Add Photos",
+                    on_release=self.queue_from_gallery
+                ),
+                MDRaisedButton(
+                    text="📷 Add Photo",
+                    on_release=self.queue_from_camera
+                ),
+                MDRaisedButton(
+                    text="Clear Finished",
+                    on_release=self.clear_queue
+                ),
+                MDRaisedButton(
+                    text="Close",
+                    on_release=self.close_queue
+                ),
+            ],
+        )
+        self.dialog = self.queue_dialog
+        self.queue_dialog.open()
+    
+    def queue_summary(self, limit=10):
+        """Return the queue counts and the latest items as dialog text"""
+        counts = self.analysis_queue.counts()
+        lines = [f"Analyzed: {counts['done']}   Waiting: {counts['pending']}   Failed: {counts['failed']}", ""]
+        for item in self.analysis_queue.items()[-limit:]:
+            name = os.path.basename(item['path'])
+            if item['status'] == 'done' and item['result']['predicted_class'] is None:
+                lines.append(f"📷 {name}: {quality_message(item['result']['quality'])}")
+            elif item['status'] == 'done':
+                result = item['result']
+                lines.append(f"✅ {name}: {result['predicted_class']} ({result['confidence']:.0%})")
+            elif item['status'] == 'failed':
+                lines.append(f"❌ {name}: {item['error']}")
+            else:
+                lines.append(f"⏳ {name}")
+        if len(lines) == 2:
+            lines.append("Add photos to analyze them in the background.")
+        return "\n".join(lines)
+    
+    def queue_from_gallery(self, instance):
+        """Pick several gallery images to add to the queue"""
+        try:
+            from plyer import filechooser
+            filechooser.open_file(
+                on_selection=self.queue_selected_images,
+                filters=[("Image files", "*.jpg", "*.jpeg", "*.png", "*.webp")],
+                multiple=True
+            )
+        except Exception as e:
+            self.show_error_dialog(f"Gallery error: {str(e)}")
+    
+    def queue_from_camera(self, instance):
+        """Take a photo and add it to the queue"""
+        try:
+            from plyer import camera
+            filename = f"monkeypox_photo_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jpg"
+            camera.take_picture(
+                filename=os.path.join(self.user_data_dir, filename),
+                on_complete=lambda path: self.queue_selected_images([path] if path else [])
+            )
+        except Exception as e:
+            self.show_error_dialog(f"Camera error: {str(e)}")
+    
+    def queue_selected_images(self, selection):
+        """Add picked images to the queue (may be called off the UI thread)"""
+        if selection:
+            self.analysis_queue.add(selection)
+            self.post_to_ui(self.refresh_queue_status)
+    
+    def queue_item_finished(self, item):
+        """Show progress as each queued photo is analyzed"""
+        self.refresh_queue_status()
+    
+    def refresh_queue_status(self):
+        """Update the status line and the open queue dialog"""
+        counts = self.analysis_queue.counts()
+        if counts['pending']:
+            self.status_label.text = f"🗂️ Analyzing photos: {counts['done'] + counts['failed']} done, {counts['pending']} waiting"
+        else:
+            self.status_label.text = f"✅ Photo queue finished ({counts['done']} analyzed)"
+        if self.queue_dialog:
+            self.queue_dialog.text = self.queue_summary()
+    
+    def clear_queue(self, instance):
+        """Remove analyzed photos from the queue"""
+        self.analysis_queue.clear_finished()
+        self.refresh_queue_status()
+    
+    def close_queue(self, instance):
+        """Close the queue dialog; analysis continues in the background"""
+        if self.queue_dialog:
+            self.queue_dialog.dismiss()
+            self.queue_dialog = None
+    
+    def show_retake_dialog(self, quality):
+        """Explain why a photo could not be analyzed"""
+        self.dialog = MDDialog(
+            title="📷 Please Retake Photo",
+            text=f"This photo could not be analyzed:\n\n{quality_message(quality)}",
+            buttons=[
+                MDRaisedButton(
+                    text="Retake",
+                    on_release=self.retake_photo
+                ),
+                MDRaisedButton(
+                    text="Close",
+                    on_release=self.close_dialog
+                ),
+            ],
+        )
+        self.dialog.open()
+    
+    def retake_photo(self, instance):
+        """Close the dialog and choose a new image"""
+        self.close_dialog(instance)
+        self.open_camera_or_gallery(instance)
+    
     def show_medical_info(self, instance):
         """Show medical information and guidance"""
         content = """
@@ -351,6 +609,12 @@ Text HOME to 741741
         self.dialog = MDDialog(
             title="Processing...",
             text=message,
+            buttons=[
+                MDRaisedButton(
+                    text="Cancel",
+                    on_release=self.cancel_analysis
+                ),
+            ],
         )
         self.dialog.open()
     
@@ -379,9 +643,55 @@ Text HOME to 741741
             self.dialog.dismiss()
     
     def save_result(self, instance):
-        """Save analysis result"""
-        # TODO: Implement result saving
+        """Save analysis result to the on-device history"""
+        if self.last_result and self.analyzed_image_path:
+            # Written on the history thread; the dialog closes immediately
+            future = self.history.append(self.analyzed_image_path, self.last_result)
+            future.add_done_callback(
+                lambda f: Clock.schedule_once(lambda dt: self.result_saved(f), 0)
+            )
         self.close_dialog(instance)
+    
+    def result_saved(self, future):
+        """Report the outcome of a history save on the UI thread"""
+        error = future.exception()
+        if error is None:
+            self.status_label.text = "💾 Result saved"
+        else:
+            Logger.error(f"MonkeypoxApp: Could not save result: {error}")
+            self.status_label.text = "❌ Could not save result"
+    
+    def show_history(self, instance):
+        """Show the most recently saved results"""
+        entries = self.history.recent(10)
+        if entries:
+            content = "\n".join(
+                f"{datetime.fromtimestamp(entry['timestamp']):%Y-%m-%d %H:%M}  "
+                f"{entry['predicted_class']} ({entry['confidence']:.0%})"
+                for entry in entries
+            )
+        else:
+            content = "No saved results yet."
+        
+        self.dialog = MDDialog(
+            title="Saved Results",
+            text=content,
+            buttons=[
+                MDRaisedButton(
+                    text="Close",
+                    on_release=self.close_dialog
+                ),
+            ],
+        )
+        self.dialog.open()
+
+    def on_stop(self):
+        """Stop the background workers when the app closes"""
+        self.analysis_worker.stop()
+        if self.history:
+            self.history.stop()
+        if self.analysis_queue:
+            self.analysis_queue.stop()
 
 if __name__ == "__main__":
     MonkeypoxMobileApp().run()
@@ -0,0 +1,248 @@
+"""
+Result History
+On-device log of saved analysis results. Each result is one compact binary
+record appended to a single file, written on a background thread so saving
+never blocks the UI. Recent entries are read backwards from the end of the
+file, and the log is compacted to the newest entries when it grows too long.
+
+Record layout (little-endian):
+    length:u32 | timestamp:f64 count:u8 probabilities:f32*count sha256:32B thumbnail:utf-8 | crc32:u32 length:u32
+The length is stored on both sides so the file can be walked in either direction.
+"""
+
+import hashlib
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+from concurrent.futures import Future
+
+from PIL import Image
+
+# Same as MonkeypoxConfig.CLASS_NAMES; kept here to avoid importing torch
+CLASS_NAMES = ('Monkey Pox', 'Others')
+
+MAGIC = b'MPXHIST1'
+HEADER = struct.Struct('<I')
+TRAILER = struct.Struct('<II')
+FIELDS = struct.Struct('<dB')
+DIGEST_SIZE = 32
+
+MAX_ENTRIES = 500
+# Compact once the log holds this many times MAX_ENTRIES records
+COMPACT_FACTOR = 1.5
+THUMBNAIL_SIZE = 96
+
+
+def encode_record(timestamp, probabilities, digest, thumbnail):
+    """Return the framed bytes of one history record"""
+    payload = (
+        FIELDS.pack(timestamp, len(probabilities))
+        + struct.pack(f'<{len(probabilities)}f', *probabilities)
+        + digest
+        + thumbnail.encode('utf-8')
+    )
+    return HEADER.pack(len(payload)) + payload + TRAILER.pack(zlib.crc32(payload), len(payload))
+
+
+def decode_payload(payload):
+    """Return the entry dict stored in a record payload"""
+    timestamp, count = FIELDS.unpack_from(payload)
+    offset = FIELDS.size
+    probabilities = struct.unpack_from(f'<{count}f', payload, offset)
+    offset += 4 * count
+    digest = payload[offset:offset + DIGEST_SIZE]
+    thumbnail = payload[offset + DIGEST_SIZE:].decode('utf-8')
+    index = max(range(count), key=probabilities.__getitem__)
+    return {
+        'timestamp': timestamp,
+        'sha256': digest.hex(),
+        'thumbnail': thumbnail or None,
+        'predicted_class': CLASS_NAMES[index],
+        'confidence': probabilities[index],
+        'probabilities': dict(zip(CLASS_NAMES, probabilities)),
+    }
+
+
+def file_sha256(path, chunk_size=1 << 16):
+    """Hash a file without reading it into memory at once"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.digest()
+
+
+class ResultHistory:
+    """Append-only result log with a background writer thread.
+
+    `append` returns immediately with a Future resolving to the stored
+    entry; `recent` lists the newest entries, newest first. A torn record
+    left by a crash mid-write is truncated away when the log is opened.
+    """
+
+    def __init__(self, history_dir, max_entries=MAX_ENTRIES, thumbnail_size=THUMBNAIL_SIZE):
+        self.history_dir = os.path.abspath(history_dir)
+        self.log_path = os.path.join(self.history_dir, 'history.log')
+        self.thumbnail_dir = os.path.join(self.history_dir, 'thumbnails')
+        self.max_entries = max_entries
+        self.thumbnail_size = thumbnail_size
+        self.count = 0
+        # Guards the log file between the writer thread and readers
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="result-history", daemon=True)
+        self._thread.start()
+
+    def append(self, image_path, result):
+        """Queue a result for saving and return a Future resolving to its entry"""
+        return self._submit(self._save, image_path, result, time.time())
+
+    def recent(self, limit=20):
+        """Return up to `limit` saved entries, newest first"""
+        entries = []
+        with self._lock:
+            if not os.path.exists(self.log_path):
+                return entries
+            with open(self.log_path, 'rb') as f:
+                position = f.seek(0, os.SEEK_END)
+                while position > len(MAGIC) + HEADER.size + TRAILER.size and len(entries) < limit:
+                    f.seek(position - TRAILER.size)
+                    crc, length = TRAILER.unpack(f.read(TRAILER.size))
+                    start = position - TRAILER.size - length - HEADER.size
+                    if start < len(MAGIC):
+                        break
+                    f.seek(start)
+                    (header_length,) = HEADER.unpack(f.read(HEADER.size))
+                    payload = f.read(length)
+                    if header_length != length or zlib.crc32(payload) != crc:
+                        break
+                    entries.append(self._entry(payload))
+                    position = start
+        return entries
+
+    def compact(self):
+        """Queue a compaction and return a Future resolving to the number of records kept"""
+        return self._submit(self._compact)
+
+    def stop(self, timeout=2.0):
+        """Finish queued saves and stop the writer thread"""
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _submit(self, method, *args):
+        future = Future()
+        self._queue.put((method, args, future))
+        return future
+
+    def _compact(self):
+        # Runs on the writer thread, so no save is half done while thumbnails are pruned
+        with self._lock:
+            payloads = [payload for _, payload in self._scan()][-self.max_entries:]
+            tmp_path = self.log_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(MAGIC)
+                for payload in payloads:
+                    f.write(HEADER.pack(len(payload)) + payload + TRAILER.pack(zlib.crc32(payload), len(payload)))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.log_path)
+            self.count = len(payloads)
+
+            # Thumbnails of dropped entries are no longer referenced
+            kept = {decode_payload(payload)['thumbnail'] for payload in payloads}
+            for name in os.listdir(self.thumbnail_dir):
+                if name not in kept:
+                    os.remove(os.path.join(self.thumbnail_dir, name))
+            return self.count
+
+    def _entry(self, payload):
+        entry = decode_payload(payload)
+        if entry['thumbnail']:
+            entry['thumbnail'] = os.path.join(self.thumbnail_dir, entry['thumbnail'])
+        return entry
+
+    def _scan(self):
+        """Yield (end offset, payload) for each valid record from the start of the log"""
+        with open(self.log_path, 'rb') as f:
+            position = len(MAGIC)
+            f.seek(position)
+            while True:
+                header = f.read(HEADER.size)
+                if len(header) < HEADER.size:
+                    return
+                (length,) = HEADER.unpack(header)
+                payload = f.read(length)
+                trailer = f.read(TRAILER.size)
+                if len(payload) < length or len(trailer) < TRAILER.size:
+                    return
+                crc, trailer_length = TRAILER.unpack(trailer)
+                if trailer_length != length or zlib.crc32(payload) != crc:
+                    return
+                position += HEADER.size + length + TRAILER.size
+                yield position, payload
+
+    def _open_log(self):
+        """Create the log, or drop any torn record at its end"""
+        os.makedirs(self.thumbnail_dir, exist_ok=True)
+        with self._lock:
+            valid = False
+            if os.path.exists(self.log_path):
+                with open(self.log_path, 'rb') as f:
+                    valid = f.read(len(MAGIC)) == MAGIC
+            if not valid:
+                with open(self.log_path, 'wb') as f:
+                    f.write(MAGIC)
+                return
+
+            end, count = len(MAGIC), 0
+            for end, _ in self._scan():
+                count += 1
+            if end < os.path.getsize(self.log_path):
+                with open(self.log_path, 'r+b') as f:
+                    f.truncate(end)
+            self.count = count
+
+    def _save_thumbnail(self, image_path, name):
+        path = os.path.join(self.thumbnail_dir, name)
+        if os.path.exists(path):
+            return
+        with Image.open(image_path) as image:
+            image.draft('RGB', (self.thumbnail_size, self.thumbnail_size))
+            thumbnail = image.convert('RGB')
+        thumbnail.thumbnail((self.thumbnail_size, self.thumbnail_size))
+        tmp_path = path + '.tmp'
+        thumbnail.save(tmp_path, format='JPEG', quality=70)
+        os.replace(tmp_path, path)
+
+    def _save(self, image_path, result, timestamp):
+        digest = file_sha256(image_path)
+        # One thumbnail per distinct image, however often it is saved
+        thumbnail = digest.hex()[:20] + '.jpg'
+        self._save_thumbnail(image_path, thumbnail)
+
+        probabilities = [result['probabilities'].get(name, 0.0) for name in CLASS_NAMES]
+        record = encode_record(timestamp, probabilities, digest, thumbnail)
+        with self._lock:
+            with open(self.log_path, 'ab') as f:
+                f.write(record)
+                f.flush()
+                os.fsync(f.fileno())
+            self.count += 1
+        if self.count > self.max_entries * COMPACT_FACTOR:
+            self._compact()
+        return self._entry(record[HEADER.size:-TRAILER.size])
+
+    def _run(self):
+        self._open_log()
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            method, args, future = job
+            try:
+                future.set_result(method(*args))
+            except Exception as e:
+                future.set_exception(e)
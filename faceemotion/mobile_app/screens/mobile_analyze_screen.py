@@ -4,9 +4,7 @@ Mobile-optimized image upload and classification interface
 """
 
 import streamlit as st
-from PIL import Image
 import os
-from datetime import datetime
 import sys
 
 # Add the parent directories to the path for imports
@@ -14,9 +12,20 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
 try:
-    from monkeypox_model.monkeypox_configuration import MonkeypoxModel
+    from monkeypox_model.registry import get_model
+    from monkeypox_model.inference import InferenceBusyError
+    from monkeypox_model.quality import quality_message
+    from monkeypox_model.uploads import load_upload, predict_upload
 except ImportError:
-    st.error("Could not import MonkeypoxModel. Please check the model configuration.")
+    st.error("Could not import the model registry. Please check the model configuration.")
+
+try:
+    from monkeypox_collections import get_collection_index, get_collection_writer, CollectionBusyError
+except ImportError:
+    st.error("Could not import the collections index. Please check the installation.")
+
+# Longest side of the preview shown in place of the full-resolution upload
+PREVIEW_SIZE = 720
 
 def show_mobile_analyze_screen():
     """Display the mobile-optimized image analysis screen"""
@@ -33,28 +42,9 @@ def show_mobile_analyze_screen():
     </div>
     """, unsafe_allow_html=True)
     
-    # Initialize model
-    @st.cache_resource
-    def load_model():
-        """Load the monkeypox model"""
-        try:
-            model_path = os.path.join(
-                os.path.dirname(__file__), 
-                '..', '..', 
-                'monkeypox_model', 
-                'best_model.pth'
-            )
-            model = MonkeypoxModel()
-            success = model.load_model(model_path)
-            if success:
-                return model
-            else:
-                return None
-        except Exception as e:
-            st.error(f"Error loading model: {e}")
-            return None
-    
-    model = load_model()
+    # Shared model, loaded and warmed up once per process
+    with st.spinner("🤖 Loading model..."):
+        model = get_model()
     
     if model is None:
         st.error("❌ Failed to load the classification model. Please check the model file.")
@@ -79,11 +69,11 @@ def show_mobile_analyze_screen():
     if image_source is not None:
         try:
             # Load and display image
-            image = Image.open(image_source).convert("RGB")
+            upload = load_upload(image_source, st.session_state, 'mobile_analysis_cache', PREVIEW_SIZE)
             
             # Mobile-optimized image display
             st.markdown("#### 📷 Your Image")
-            st.image(image, caption="Uploaded Image", use_container_width=True)
+            st.image(upload['preview'], caption="Uploaded Image", use_container_width=True)
             
             # Analysis section
             st.markdown("#### 🤖 AI Analysis")
@@ -91,11 +81,20 @@ def show_mobile_analyze_screen():
             # Make prediction
             with st.spinner("🔄 Analyzing image..."):
                 try:
-                    prediction_result = model.predict(image)
+                    prediction_result = predict_upload(upload)
                     
                     predicted_class = prediction_result['predicted_class']
                     confidence = prediction_result['confidence']
                     probabilities = prediction_result['probabilities']
+                    quality = prediction_result.get('quality')
+                    
+                    # The quality gate rejects unusable photos before the model runs
+                    if predicted_class is None:
+                        st.warning(f"📷 **Image not analyzed**: {quality_message(quality)}")
+                        st.info("Please retake the photo or upload a clearer image.")
+                        return
+                    if quality and quality['status'] == 'warning':
+                        st.info(f"📷 {quality_message(quality)}")
                     
                     # Mobile-optimized results display
                     if predicted_class == "Monkey Pox":
@@ -124,6 +123,9 @@ def show_mobile_analyze_screen():
                     for class_name, prob in probabilities.items():
                         st.progress(prob, text=f"{class_name}: {prob:.1%}")
                     
+                except InferenceBusyError as e:
+                    st.warning(f"⏳ {e}")
+                    return
                 except Exception as e:
                     st.error(f"Error during prediction: {e}")
                     return
@@ -154,7 +156,7 @@ def show_mobile_analyze_screen():
                 
                 # Save button
                 if st.button("💾 Save to Collection", key="save_mobile", use_container_width=True):
-                    save_mobile_image(image, save_class, confidence)
+                    save_mobile_image(upload['data'], save_class, confidence)
         
         except Exception as e:
             st.error(f"Error processing image: {e}")
@@ -243,41 +245,25 @@ def show_mobile_other_guidance():
         - Monitor for changes
         """)
 
-def save_mobile_image(image, save_class, confidence):
-    """Save the analyzed image from mobile interface"""
+def save_mobile_image(image_bytes, save_class, confidence):
+    """Queue the analyzed image from mobile interface for saving"""
     try:
-        # Create timestamp
-        now = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # Determine save directory
         base_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'app', 'collections')
-        save_dir = os.path.join(base_dir, save_class)
-        
-        # Create directory if it doesn't exist
-        os.makedirs(save_dir, exist_ok=True)
         
-        # Create filename with confidence score
-        confidence_str = f"{confidence:.3f}".replace('.', '')
-        filename = f"mobile_{save_class.replace(' ', '_')}_{now}_conf{confidence_str}.jpg"
-        save_path = os.path.join(save_dir, filename)
-        
-        # Convert and save image for mobile
-        if image.mode in ('RGBA', 'LA', 'P'):
-            rgb_image = Image.new('RGB', image.size, (255, 255, 255))
-            if image.mode == 'P':
-                image = image.convert('RGBA')
-            rgb_image.paste(image, mask=image.split()[-1] if image.mode in ('RGBA', 'LA') else None)
-            image = rgb_image
-        
-        image.save(save_path, format='JPEG', quality=95)
+        # Encoding and writing happen on the background writer, off the request path
+        get_collection_writer(base_dir).submit(
+            None, save_class, confidence, source='mobile', original_bytes=image_bytes
+        )
         
         # Mobile-optimized success message
-        st.success("✅ Image saved!")
-        st.info(f"📁 Saved as: `{filename}`")
+        st.success("✅ Image queued for saving!")
         
-        # Show updated stats
+        # The counts only include images the writer has finished storing
         show_mobile_collection_stats()
+        st.caption("Counts include an image once it has been written, which may take a moment.")
         
+    except CollectionBusyError as e:
+        st.warning(f"⏳ {e}")
     except Exception as e:
         st.error(f"❌ Error saving: {e}")
 
@@ -286,13 +272,10 @@ def show_mobile_collection_stats():
     try:
         base_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'app', 'collections')
         
-        monkey_pox_dir = os.path.join(base_dir, 'Monkey Pox')
-        others_dir = os.path.join(base_dir, 'Others')
-        
-        monkey_pox_count = len([f for f in os.listdir(monkey_pox_dir) 
-                               if f.endswith(('.jpg', '.jpeg', '.png', '.webp'))]) if os.path.exists(monkey_pox_dir) else 0
-        others_count = len([f for f in os.listdir(others_dir) 
-                           if f.endswith(('.jpg', '.jpeg', '.png', '.webp'))]) if os.path.exists(others_dir) else 0
+        # Counts come from the collections index instead of listing the folders
+        counts = get_collection_index(base_dir).counts()
+        monkey_pox_count = counts['Monkey Pox']
+        others_count = counts['Others']
         
         st.markdown("**📊 Your Collection:**")
         col1, col2, col3 = st.columns(3)
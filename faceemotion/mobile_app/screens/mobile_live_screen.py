@@ -0,0 +1,104 @@
+"""
+Mobile Live Screen
+Real-time camera screening with a smoothed on-video prediction overlay
+"""
+
+import streamlit as st
+from PIL import ImageDraw
+import os
+import sys
+
+# Add the parent directories to the path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+try:
+    import av
+    from streamlit_webrtc import webrtc_streamer, WebRtcMode
+    WEBRTC_AVAILABLE = True
+except ImportError:
+    WEBRTC_AVAILABLE = False
+
+try:
+    from monkeypox_model.inference import get_inference_executor
+    from monkeypox_model.live import LiveAnalyzer
+except ImportError:
+    st.error("Could not import the live analyzer. Please check the model configuration.")
+
+# Camera resolution requested from the browser; frames are analyzed at model size anyway
+VIDEO_CONSTRAINTS = {"width": {"ideal": 640}, "height": {"ideal": 480}, "frameRate": {"ideal": 15}}
+OVERLAY_COLORS = {"Monkey Pox": (255, 107, 107), "Others": (81, 207, 102)}
+
+def stop_live_analyzer():
+    """Stop this session's live analyzer, if any, without waiting for a prediction in flight"""
+    analyzer = st.session_state.pop('live_analyzer', None)
+    if analyzer is not None:
+        analyzer.stop()
+
+def show_mobile_live_screen():
+    """Display the live camera screening screen"""
+
+    # Navigation
+    if st.button("🏠 Back to Home", key="back_live"):
+        stop_live_analyzer()
+        st.session_state.page = "main"
+        st.rerun()
+
+    st.markdown("""
+    <div class="pwa-header">
+        <h1>🎥 Live Screening</h1>
+        <p>Point your camera at the skin lesion</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    if not WEBRTC_AVAILABLE:
+        st.error("❌ Live mode needs the streamlit-webrtc package. Install it with `pip install streamlit-webrtc`.")
+        return
+
+    # One analyzer per session; the frame callback runs outside the script thread
+    if 'live_analyzer' not in st.session_state:
+        st.session_state.live_analyzer = LiveAnalyzer(get_inference_executor().predict)
+    analyzer = st.session_state.live_analyzer
+
+    def video_frame_callback(frame):
+        image = frame.to_image()
+        # The analyzer gets its own copy; the overlay is drawn on the displayed frame
+        analyzer.submit(image.copy())
+        draw_overlay(image, analyzer.prediction())
+        return av.VideoFrame.from_image(image)
+
+    ctx = webrtc_streamer(
+        key="live_screening",
+        mode=WebRtcMode.SENDRECV,
+        video_frame_callback=video_frame_callback,
+        media_stream_constraints={"video": VIDEO_CONSTRAINTS, "audio": False},
+        async_processing=True,
+    )
+    if not ctx.state.playing:
+        # Stream stopped or not started yet; the next start gets a fresh analyzer
+        stop_live_analyzer()
+
+    st.info("""
+    💡 **Tips for live screening:**
+    - Hold the camera steady, 10-20 cm from the lesion
+    - Use good, even lighting
+    - The result settles after a second or two of a steady view
+    """)
+
+    st.warning("""
+    🏥 **MEDICAL DISCLAIMER**: Live results are for screening only.
+    Take a photo in **Analyze** mode to save it, and always consult a healthcare professional.
+    """)
+
+def draw_overlay(image, prediction):
+    """Draw the current smoothed prediction as a banner across the top of a frame"""
+    draw = ImageDraw.Draw(image)
+    banner_height = max(24, image.height // 12)
+    if prediction is None:
+        draw.rectangle((0, 0, image.width, banner_height), fill=(60, 60, 60))
+        draw.text((10, banner_height // 4), "Analyzing...", fill=(255, 255, 255))
+        return
+
+    predicted_class = prediction['predicted_class']
+    label = "POTENTIAL MONKEYPOX" if predicted_class == "Monkey Pox" else "NON-MONKEYPOX"
+    draw.rectangle((0, 0, image.width, banner_height), fill=OVERLAY_COLORS.get(predicted_class, (60, 60, 60)))
+    draw.text((10, banner_height // 4), f"{label}  {prediction['confidence']:.0%}", fill=(255, 255, 255))
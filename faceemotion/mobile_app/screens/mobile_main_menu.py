@@ -4,6 +4,16 @@ Mobile-optimized landing page for the Monkeypox Classifier Application
 """
 
 import streamlit as st
+import os
+import sys
+
+# Add the parent directories to the path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+try:
+    from monkeypox_collections import get_collection_index
+except ImportError:
+    st.error("Could not import the collections index. Please check the installation.")
 
 def show_mobile_main_menu():
     """Display the mobile-optimized main menu screen"""
@@ -41,6 +51,10 @@ def show_mobile_main_menu():
         st.session_state.page = "analyze"
         st.rerun()
     
+    if st.button("🎥 LIVE CAMERA SCREENING", key="live_main"):
+        st.session_state.page = "live"
+        st.rerun()
+    
     # Secondary actions in columns for mobile
     col1, col2 = st.columns(2)
     
@@ -160,17 +174,11 @@ def show_quick_stats():
     st.markdown("### 📊 Quick Stats")
     
     try:
-        # Try to get collection stats
-        import os
+        # Try to get collection stats from the collections index
         base_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'app', 'collections')
-        
-        monkey_pox_dir = os.path.join(base_dir, 'Monkey Pox')
-        others_dir = os.path.join(base_dir, 'Others')
-        
-        monkey_pox_count = len([f for f in os.listdir(monkey_pox_dir) 
-                               if f.endswith(('.jpg', '.jpeg', '.png', '.webp'))]) if os.path.exists(monkey_pox_dir) else 0
-        others_count = len([f for f in os.listdir(others_dir) 
-                           if f.endswith(('.jpg', '.jpeg', '.png', '.webp'))]) if os.path.exists(others_dir) else 0
+        counts = get_collection_index(base_dir).counts()
+        monkey_pox_count = counts['Monkey Pox']
+        others_count = counts['Others']
         
         # Mobile-optimized metrics
         col1, col2, col3 = st.columns(3)
@@ -0,0 +1,17 @@
+"""
+Monkeypox Collections Package
+Storage and indexing for user-confirmed collection images
+"""
+
+from .collection_index import CollectionIndex, get_collection_index
+from .storage_policy import STORAGE_POLICIES, StoragePolicy, get_storage_policy
+from .store import ObjectStore
+from .thumbnails import ThumbnailCache, get_thumbnail_cache
+from .writer import CollectionBusyError, CollectionWriter, get_collection_writer
+
+__all__ = [
+    'CollectionIndex', 'get_collection_index', 'ObjectStore',
+    'StoragePolicy', 'STORAGE_POLICIES', 'get_storage_policy',
+    'ThumbnailCache', 'get_thumbnail_cache',
+    'CollectionBusyError', 'CollectionWriter', 'get_collection_writer',
+]
@@ -0,0 +1,335 @@
+"""
+Collection Index
+SQLite (WAL mode) index of saved collection images, so statistics and
+queries never have to list the collection folders.
+
+Images are content-addressed: `objects` holds one row per distinct image
+(by SHA-256) with its current label, and `labels` keeps every label a user
+confirmed, so re-saving an existing image only adds a label record.
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+
+from .store import ObjectStore
+
+# Default collections folder shared by the desktop and mobile apps
+COLLECTIONS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'app', 'collections'))
+INDEX_FILENAME = 'collection_index.sqlite3'
+SCHEMA_VERSION = 2
+
+CLASS_NAMES = ('Monkey Pox', 'Others')
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.avif')
+
+# Matches "<class>_<YYYYmmdd_HHMMSS>_conf<digits>.jpg", optionally prefixed "mobile_"
+FILENAME_PATTERN = re.compile(r'^(?P<mobile>mobile_)?.*_(?P<ts>\d{8}_\d{6})(?:_conf(?P<conf>\d+))?\.\w+$')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    sha256 TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    class_name TEXT NOT NULL,
+    confidence REAL,
+    source TEXT NOT NULL DEFAULT 'desktop',
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    size INTEGER,
+    label_count INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_objects_class_created ON objects (class_name, created_at);
+CREATE INDEX IF NOT EXISTS idx_objects_created ON objects (created_at);
+
+CREATE TABLE IF NOT EXISTS labels (
+    id INTEGER PRIMARY KEY,
+    sha256 TEXT NOT NULL REFERENCES objects (sha256) ON DELETE CASCADE,
+    class_name TEXT NOT NULL,
+    confidence REAL,
+    source TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_labels_sha256 ON labels (sha256);
+
+-- Per-class totals kept up to date by triggers, so counts are a tiny lookup
+CREATE TABLE IF NOT EXISTS class_counts (
+    class_name TEXT PRIMARY KEY,
+    count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TRIGGER IF NOT EXISTS objects_count_insert AFTER INSERT ON objects BEGIN
+    INSERT INTO class_counts (class_name, count) VALUES (NEW.class_name, 1)
+    ON CONFLICT(class_name) DO UPDATE SET count = count + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS objects_count_delete AFTER DELETE ON objects BEGIN
+    UPDATE class_counts SET count = count - 1 WHERE class_name = OLD.class_name;
+END;
+CREATE TRIGGER IF NOT EXISTS objects_count_update AFTER UPDATE OF class_name ON objects
+WHEN OLD.class_name != NEW.class_name BEGIN
+    UPDATE class_counts SET count = count - 1 WHERE class_name = OLD.class_name;
+    INSERT INTO class_counts (class_name, count) VALUES (NEW.class_name, 1)
+    ON CONFLICT(class_name) DO UPDATE SET count = count + 1;
+END;
+"""
+
+# Tables from the path-keyed index (schema version 1), rebuilt from disk on upgrade
+LEGACY_TABLES = ('images', 'class_counts')
+
+
+def parse_collection_filename(filename):
+    """Recover (source, created_at, confidence) from a legacy collection filename"""
+    match = FILENAME_PATTERN.match(filename)
+    if not match:
+        return 'desktop', None, None
+    created_at = datetime.strptime(match.group('ts'), "%Y%m%d_%H%M%S").isoformat()
+    confidence = None
+    if match.group('conf'):
+        # "0957" -> 0.957, "1000" -> 1.000
+        confidence = int(match.group('conf')) / 10 ** (len(match.group('conf')) - 1)
+    return ('mobile' if match.group('mobile') else 'desktop'), created_at, confidence
+
+
+class CollectionIndex:
+    """Index of collection images backed by a SQLite database in WAL mode.
+
+    Connections are kept per thread because Streamlit serves each session
+    from its own thread.
+    """
+
+    def __init__(self, collections_dir=COLLECTIONS_DIR, db_path=None):
+        self.collections_dir = os.path.abspath(collections_dir)
+        self.db_path = db_path or os.path.join(self.collections_dir, INDEX_FILENAME)
+        self.store = ObjectStore(self.collections_dir)
+        self._local = threading.local()
+        os.makedirs(self.collections_dir, exist_ok=True)
+
+        conn = self._connection()
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < SCHEMA_VERSION:
+            for table in LEGACY_TABLES:
+                conn.execute(f"DROP TABLE IF EXISTS {table}")
+            conn.executescript(SCHEMA)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            # First run or upgrade: pick up images saved before this index existed
+            self.sync()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    def add_label(self, sha256, path, class_name, confidence=None, source='desktop',
+                  created_at=None, size=None):
+        """Record that a user confirmed `class_name` for an image.
+
+        The first label creates the object row; later labels only append to
+        the label history and update the object's current label.
+        Returns True if the image was new to the index.
+        """
+        created_at = created_at or datetime.now().isoformat(timespec='seconds')
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            exists = conn.execute("SELECT 1 FROM objects WHERE sha256 = ?", (sha256,)).fetchone()
+            if exists:
+                conn.execute(
+                    """
+                    UPDATE objects SET class_name = ?, confidence = ?, updated_at = ?,
+                        label_count = label_count + 1
+                    WHERE sha256 = ?
+                    """,
+                    (class_name, confidence, created_at, sha256),
+                )
+            else:
+                conn.execute(
+                    """
+                    INSERT INTO objects (sha256, path, class_name, confidence, source,
+                                         created_at, updated_at, size)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (sha256, path, class_name, confidence, source, created_at, created_at, size),
+                )
+            conn.execute(
+                "INSERT INTO labels (sha256, class_name, confidence, source, created_at) VALUES (?, ?, ?, ?, ?)",
+                (sha256, class_name, confidence, source, created_at),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return not exists
+
+    def remove(self, sha256):
+        """Remove an image and its label history from the index"""
+        self._connection().execute("DELETE FROM objects WHERE sha256 = ?", (sha256,))
+
+    def counts(self):
+        """Return {class_name: count} for every known class"""
+        counts = dict.fromkeys(CLASS_NAMES, 0)
+        for row in self._connection().execute("SELECT class_name, count FROM class_counts"):
+            counts[row['class_name']] = row['count']
+        return counts
+
+    def _filters(self, class_name=None, min_confidence=None, max_confidence=None,
+                 since=None, until=None):
+        clauses = []
+        params = []
+        if class_name:
+            clauses.append("class_name = ?")
+            params.append(class_name)
+        if min_confidence is not None:
+            clauses.append("confidence >= ?")
+            params.append(min_confidence)
+        if max_confidence is not None:
+            clauses.append("confidence <= ?")
+            params.append(max_confidence)
+        if since:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        if until:
+            clauses.append("created_at < ?")
+            params.append(until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    def count(self, **filters):
+        """Return the number of images matching the filters"""
+        where, params = self._filters(**filters)
+        return self._connection().execute(f"SELECT COUNT(*) FROM objects {where}", params).fetchone()[0]
+
+    def query(self, limit=50, offset=0, **filters):
+        """Return matching images, newest first, as a list of dicts"""
+        where, params = self._filters(**filters)
+        rows = self._connection().execute(
+            f"SELECT * FROM objects {where} ORDER BY created_at DESC, sha256 LIMIT ? OFFSET ?",
+            params + [limit, offset],
+        )
+        return [dict(row) for row in rows]
+
+    def iter_objects(self):
+        """Yield every indexed image as a dict"""
+        for row in self._connection().execute("SELECT * FROM objects ORDER BY created_at"):
+            yield dict(row)
+
+    def find_by_hash(self, sha256):
+        """Return the index row for an image, or None"""
+        row = self._connection().execute("SELECT * FROM objects WHERE sha256 = ?", (sha256,)).fetchone()
+        return dict(row) if row else None
+
+    def label_history(self, sha256):
+        """Return every label recorded for an image, oldest first"""
+        rows = self._connection().execute(
+            "SELECT * FROM labels WHERE sha256 = ? ORDER BY id", (sha256,)
+        )
+        return [dict(row) for row in rows]
+
+    def absolute_path(self, relative_path):
+        """Return the absolute path of an indexed image"""
+        return self.store.absolute_path(relative_path)
+
+    def _legacy_files(self):
+        """Yield (DirEntry, class_name) for images in the per-class folders"""
+        for class_name in CLASS_NAMES:
+            class_dir = os.path.join(self.collections_dir, class_name)
+            if not os.path.isdir(class_dir):
+                continue
+            for entry in os.scandir(class_dir):
+                if entry.is_file() and entry.name.lower().endswith(IMAGE_EXTENSIONS):
+                    yield entry, class_name
+
+    def sync(self):
+        """Reconcile the index with the files on disk.
+
+        Indexes images in the legacy per-class folders (in place, by hash)
+        and drops entries whose files no longer exist. Objects in the store
+        that were never labelled cannot be classified and are left alone.
+        Returns (added, removed).
+        """
+        indexed_paths = {row['path'] for row in self._connection().execute("SELECT path FROM objects")}
+        added = 0
+        for entry, class_name in self._legacy_files():
+            rel_path = f"{class_name}/{entry.name}"
+            if rel_path in indexed_paths:
+                continue
+            source, created_at, confidence = parse_collection_filename(entry.name)
+            if created_at is None:
+                created_at = datetime.fromtimestamp(entry.stat().st_mtime).isoformat(timespec='seconds')
+            with open(entry.path, 'rb') as f:
+                sha256 = hashlib.sha256(f.read()).hexdigest()
+            # A duplicate of an already indexed image adds nothing
+            if self.find_by_hash(sha256) is not None:
+                continue
+            self.add_label(sha256, rel_path, class_name, confidence, source,
+                           created_at, entry.stat().st_size)
+            added += 1
+
+        removed = 0
+        for row in list(self.iter_objects()):
+            if not os.path.exists(self.absolute_path(row['path'])):
+                self.remove(row['sha256'])
+                removed += 1
+        return added, removed
+
+    def migrate_legacy(self):
+        """Move legacy per-class files into the content-addressed store.
+
+        Duplicate files collapse onto a single object. Returns the number of
+        legacy files migrated.
+        """
+        migrated = 0
+        for entry, class_name in list(self._legacy_files()):
+            with open(entry.path, 'rb') as f:
+                data = f.read()
+            sha256, rel_path, _ = self.store.put(data, os.path.splitext(entry.name)[1].lower())
+            if self.find_by_hash(sha256) is None:
+                source, created_at, confidence = parse_collection_filename(entry.name)
+                self.add_label(sha256, rel_path, class_name, confidence, source, created_at, len(data))
+            else:
+                self._connection().execute("UPDATE objects SET path = ? WHERE sha256 = ?", (rel_path, sha256))
+            os.remove(entry.path)
+            migrated += 1
+        return migrated
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_collection_index(collections_dir=COLLECTIONS_DIR):
+    """Return the process-wide CollectionIndex for a collections folder"""
+    key = os.path.abspath(collections_dir)
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = CollectionIndex(key)
+        return _indexes[key]
+
+
+def main():
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Maintain the collections index")
+    parser.add_argument('--collections-dir', default=COLLECTIONS_DIR)
+    parser.add_argument('--sync', action='store_true', help="Reconcile the index with files on disk")
+    parser.add_argument('--migrate', action='store_true',
+                        help="Move legacy per-class files into the content-addressed store")
+    args = parser.parse_args()
+
+    index = get_collection_index(args.collections_dir)
+    if args.sync:
+        added, removed = index.sync()
+        print(f"Index synced: {added} added, {removed} removed")
+    if args.migrate:
+        print(f"Migrated {index.migrate_legacy()} legacy file(s) into the object store")
+    for class_name, count in index.counts().items():
+        print(f"{class_name}: {count}")
+
+
+if __name__ == "__main__":
+    main()
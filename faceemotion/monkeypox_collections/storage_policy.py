@@ -0,0 +1,138 @@
+"""
+Storage Policies
+Control how collection images are encoded before they are stored: the
+largest stored resolution, the image format and quality, and whether an
+upload that is already a JPEG is stored without re-encoding.
+
+Stored images carry no EXIF, XMP or IPTC metadata (camera details, GPS
+position) unless a policy opts in with keep_metadata. The policy used by
+the apps can be chosen with the MONKEYPOX_STORAGE_POLICY environment
+variable.
+"""
+
+import io
+import os
+
+from PIL import Image, ImageOps, features
+
+from monkeypox_model.imaging import flatten_to_rgb
+
+# Formats in the order they are tried; the first one Pillow can encode wins
+FORMAT_EXTENSIONS = {
+    'AVIF': '.avif',
+    'WEBP': '.webp',
+    'JPEG': '.jpg',
+}
+
+JPEG_MAGIC = b'\xff\xd8\xff'
+
+# APP1 (EXIF, XMP), APP13 (IPTC) and comment segments
+JPEG_METADATA_MARKERS = {0xE1, 0xED, 0xFE}
+JPEG_SOS, JPEG_EOI = 0xDA, 0xD9
+EXIF_ORIENTATION = 0x0112
+
+POLICY_ENV_VAR = 'MONKEYPOX_STORAGE_POLICY'
+
+
+def is_jpeg(data):
+    """Return True if the bytes start with a JPEG header"""
+    return data is not None and data[:3] == JPEG_MAGIC
+
+
+def strip_jpeg_metadata(data):
+    """Return JPEG bytes without metadata segments; the compressed image data is unchanged"""
+    parts = [data[:2]]
+    pos = 2
+    while pos + 4 <= len(data) and data[pos] == 0xFF:
+        marker = data[pos + 1]
+        if marker in (JPEG_SOS, JPEG_EOI):
+            break
+        end = pos + 2 + int.from_bytes(data[pos + 2:pos + 4], 'big')
+        if marker not in JPEG_METADATA_MARKERS:
+            parts.append(data[pos:end])
+        pos = end
+    parts.append(data[pos:])
+    return b''.join(parts)
+
+
+class StoragePolicy:
+    """How a collection image is turned into stored bytes.
+
+    formats:          preferred encoders, best first; unavailable ones are skipped
+    max_dimension:    longest stored side in pixels, or None to keep full size
+    quality:          encoder quality (0-100)
+    passthrough_jpeg: store JPEG uploads without re-encoding when they already fit max_dimension
+    keep_metadata:    keep the EXIF/XMP/IPTC segments of passed-through JPEGs;
+                      re-encoded images never carry them
+    """
+
+    def __init__(self, name, formats=('JPEG',), max_dimension=None, quality=90, passthrough_jpeg=False,
+                 keep_metadata=False):
+        self.name = name
+        self.max_dimension = max_dimension
+        self.quality = quality
+        self.passthrough_jpeg = passthrough_jpeg
+        self.keep_metadata = keep_metadata
+        self.format = next((f for f in formats if f == 'JPEG' or features.check(f.lower())), 'JPEG')
+        self.extension = FORMAT_EXTENSIONS[self.format]
+
+    def __repr__(self):
+        return (f"StoragePolicy({self.name!r}, format={self.format!r}, "
+                f"max_dimension={self.max_dimension}, quality={self.quality}, "
+                f"passthrough_jpeg={self.passthrough_jpeg}, keep_metadata={self.keep_metadata})")
+
+    def fits(self, size):
+        """Return True if an image of this (width, height) needs no downscaling"""
+        return self.max_dimension is None or max(size) <= self.max_dimension
+
+    def encode(self, image, original_bytes=None):
+        """Return (data, extension) to store for an image"""
+        if self.passthrough_jpeg and is_jpeg(original_bytes) and self.fits(image.size):
+            if self.keep_metadata:
+                return original_bytes, '.jpg'
+            # Without EXIF a rotated photo would display sideways, so only
+            # upright ones are passed through
+            if image.getexif().get(EXIF_ORIENTATION, 1) == 1:
+                return strip_jpeg_metadata(original_bytes), '.jpg'
+
+        image = flatten_to_rgb(ImageOps.exif_transpose(image))
+        if not self.fits(image.size):
+            image = image.copy()
+            image.thumbnail((self.max_dimension, self.max_dimension), Image.LANCZOS)
+
+        buffer = io.BytesIO()
+        if self.format == 'JPEG':
+            image.save(buffer, format='JPEG', quality=self.quality, optimize=True, progressive=True)
+        elif self.format == 'WEBP':
+            image.save(buffer, format='WEBP', quality=self.quality, method=6)
+        else:
+            image.save(buffer, format=self.format, quality=self.quality)
+        return buffer.getvalue(), self.extension
+
+
+# The model trains at 224x224, so even 'compact' keeps several times the
+# resolution it needs
+STORAGE_POLICIES = {
+    # Previous behaviour: full resolution, high-quality JPEG, JPEG uploads not re-encoded
+    'original': StoragePolicy('original', formats=('JPEG',), quality=95, passthrough_jpeg=True),
+    'balanced': StoragePolicy('balanced', formats=('JPEG',), max_dimension=1600, quality=90,
+                              passthrough_jpeg=True),
+    'compact': StoragePolicy('compact', formats=('AVIF', 'WEBP', 'JPEG'), max_dimension=1024, quality=75),
+}
+
+DEFAULT_POLICY = 'balanced'
+
+
+def get_storage_policy(policy=None):
+    """Return a StoragePolicy given a policy instance or one of STORAGE_POLICIES' names.
+
+    None selects the policy named by MONKEYPOX_STORAGE_POLICY, or DEFAULT_POLICY.
+    """
+    if isinstance(policy, StoragePolicy):
+        return policy
+    if policy is None:
+        policy = os.environ.get(POLICY_ENV_VAR) or DEFAULT_POLICY
+    try:
+        return STORAGE_POLICIES[policy]
+    except KeyError:
+        raise ValueError(f"Unknown storage policy {policy!r}; choose from {', '.join(STORAGE_POLICIES)}")
@@ -0,0 +1,58 @@
+"""
+Object Store
+Content-addressed storage for collection images: each distinct image is
+stored once, named by its SHA-256 and sharded into subdirectories.
+"""
+
+import hashlib
+import os
+import threading
+
+OBJECTS_DIRNAME = 'objects'
+
+
+class ObjectStore:
+    """Stores image bytes under objects/<first two hex digits>/<sha256><ext>"""
+
+    def __init__(self, collections_dir):
+        self.collections_dir = os.path.abspath(collections_dir)
+        self.objects_dir = os.path.join(self.collections_dir, OBJECTS_DIRNAME)
+
+    @staticmethod
+    def relative_path(sha256, extension='.jpg'):
+        """Return the object path relative to the collections folder, with '/' separators"""
+        return f"{OBJECTS_DIRNAME}/{sha256[:2]}/{sha256}{extension}"
+
+    def absolute_path(self, relative_path):
+        """Return the absolute path for a path relative to the collections folder"""
+        return os.path.join(self.collections_dir, *relative_path.split('/'))
+
+    def put(self, data, extension='.jpg'):
+        """Store bytes if not already present. Returns (sha256, relative_path, created)."""
+        sha256 = hashlib.sha256(data).hexdigest()
+        relative_path = self.relative_path(sha256, extension)
+        path = self.absolute_path(relative_path)
+        if os.path.exists(path):
+            return sha256, relative_path, False
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        # Concurrent writers of the same object write identical bytes, so
+        # whichever rename lands last is still correct
+        os.replace(tmp_path, path)
+        return sha256, relative_path, True
+
+    def iter_objects(self):
+        """Yield (sha256, relative_path) for every stored object"""
+        if not os.path.isdir(self.objects_dir):
+            return
+        for shard in sorted(os.listdir(self.objects_dir)):
+            shard_dir = os.path.join(self.objects_dir, shard)
+            if not os.path.isdir(shard_dir):
+                continue
+            for entry in os.scandir(shard_dir):
+                if entry.is_file() and not entry.name.endswith('.tmp'):
+                    sha256, extension = os.path.splitext(entry.name)
+                    yield sha256, self.relative_path(sha256, extension)
@@ -0,0 +1,107 @@
+"""
+Thumbnail Cache
+Small preview images for the collections browser, created lazily and
+evicted least-recently-used first when the cache exceeds its disk budget.
+"""
+
+import hashlib
+import os
+import threading
+
+from PIL import Image, ImageOps, features
+
+from .collection_index import COLLECTIONS_DIR
+
+THUMBNAIL_DIR = os.path.join(COLLECTIONS_DIR, '.thumbnails')
+THUMBNAIL_SIZE = 256
+DISK_BUDGET_BYTES = 200 * 1024 * 1024
+
+
+class ThumbnailCache:
+    """Lazily generated thumbnails with an LRU disk budget.
+
+    Recency is tracked through file modification times, so the cache
+    survives restarts and can be shared between processes.
+    """
+
+    def __init__(self, cache_dir=THUMBNAIL_DIR, size=THUMBNAIL_SIZE, budget_bytes=DISK_BUDGET_BYTES):
+        self.cache_dir = cache_dir
+        self.size = size
+        self.budget_bytes = budget_bytes
+        self.format, self.extension = ('WEBP', '.webp') if features.check('webp') else ('JPEG', '.jpg')
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._total_bytes = sum(entry_size for _, entry_size, _ in self._entries())
+
+    def _entries(self):
+        """Yield (path, size, mtime) for every cached thumbnail"""
+        for dirpath, _, filenames in os.walk(self.cache_dir):
+            for filename in filenames:
+                if filename.endswith(self.extension):
+                    path = os.path.join(dirpath, filename)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    yield path, stat.st_size, stat.st_mtime
+
+    def _thumbnail_path(self, source_path, sha256=None):
+        if sha256 is None:
+            stat = os.stat(source_path)
+            sha256 = hashlib.sha256(f"{source_path}\0{stat.st_mtime_ns}".encode()).hexdigest()
+        return os.path.join(self.cache_dir, sha256[:2], f"{sha256}_{self.size}{self.extension}")
+
+    def get(self, source_path, sha256=None):
+        """Return the path of the thumbnail for an image, creating it if needed"""
+        path = self._thumbnail_path(source_path, sha256)
+        try:
+            # Touch on access so eviction is least-recently-used
+            os.utime(path)
+            return path
+        except FileNotFoundError:
+            pass
+
+        with Image.open(source_path) as image:
+            # Let the JPEG decoder downscale while decoding instead of decoding full size
+            image.draft('RGB', (self.size, self.size))
+            image = ImageOps.exif_transpose(image).convert('RGB')
+            image.thumbnail((self.size, self.size))
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        image.save(tmp_path, format=self.format, quality=80)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._total_bytes += os.path.getsize(path)
+            if self._total_bytes > self.budget_bytes:
+                self._evict()
+        return path
+
+    def _evict(self):
+        """Delete least recently used thumbnails until usage is below 90% of the budget"""
+        target = self.budget_bytes * 0.9
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total = sum(entry_size for _, entry_size, _ in entries)
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except FileNotFoundError:
+                pass
+        self._total_bytes = total
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_thumbnail_cache(cache_dir=THUMBNAIL_DIR):
+    """Return the process-wide ThumbnailCache for a cache folder"""
+    key = os.path.abspath(cache_dir)
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = ThumbnailCache(key)
+        return _caches[key]
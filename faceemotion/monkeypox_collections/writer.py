@@ -0,0 +1,152 @@
+"""
+Collection Writer
+Bounded background writer that encodes (per the storage policy) and
+atomically stores collection images off the Streamlit request path.
+"""
+
+import atexit
+import io
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from datetime import datetime
+
+from PIL import Image
+
+from .collection_index import COLLECTIONS_DIR, get_collection_index
+from .storage_policy import get_storage_policy
+
+MAX_PENDING = 32
+NUM_WORKERS = 2
+
+
+class CollectionBusyError(Exception):
+    """Raised when the writer queue stays full for longer than the submit timeout"""
+
+
+class CollectionWriter:
+    """Thread pool with a bounded queue for saving collection images.
+
+    `submit` returns immediately with a Future; when the queue is full it
+    waits up to `timeout` seconds and then raises CollectionBusyError, so a
+    burst of saves applies back-pressure instead of growing memory.
+    Images are encoded according to `policy` (see storage_policy; None
+    selects the configured default).
+    """
+
+    def __init__(self, collections_dir=COLLECTIONS_DIR, max_pending=MAX_PENDING, num_workers=NUM_WORKERS,
+                 policy=None):
+        self.collections_dir = os.path.abspath(collections_dir)
+        self.policy = get_storage_policy(policy)
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._closed = False
+        self._workers = [
+            threading.Thread(target=self._run, name=f"collection-writer-{i}", daemon=True)
+            for i in range(num_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    @property
+    def pending(self):
+        """Number of saves waiting in the queue"""
+        return self._queue.qsize()
+
+    def submit(self, image, save_class, confidence, source='desktop', original_bytes=None, timeout=2.0):
+        """Queue an image for saving and return a Future resolving to its index row.
+
+        Pass the uploaded file's bytes as `original_bytes` so policies with
+        JPEG passthrough can store them without re-encoding. `image` may be
+        None when `original_bytes` is given; it is then decoded on the worker.
+        """
+        if image is None and original_bytes is None:
+            raise ValueError("Either image or original_bytes is required")
+        if self._closed:
+            raise RuntimeError("CollectionWriter is shut down")
+        job = {
+            'image': image,
+            'original_bytes': original_bytes,
+            'save_class': save_class,
+            'confidence': confidence,
+            'source': source,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'future': Future(),
+        }
+        try:
+            self._queue.put(job, timeout=timeout)
+        except queue.Full:
+            raise CollectionBusyError("Too many images are being saved; please try again shortly")
+        return job['future']
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                if job['future'].set_running_or_notify_cancel():
+                    try:
+                        job['future'].set_result(self._save(job))
+                    except Exception as e:
+                        # Callers usually do not wait on the Future; make the failure visible
+                        print(f"Could not save {job['save_class']} collection image: {e}")
+                        job['future'].set_exception(e)
+            finally:
+                self._queue.task_done()
+
+    def _save(self, job):
+        """Encode one image, store it by content hash and record the label"""
+        image = job['image']
+        if image is None:
+            # Opening is lazy: a passthrough save only reads the header for the size
+            image = Image.open(io.BytesIO(job['original_bytes']))
+        data, extension = self.policy.encode(image, job['original_bytes'])
+
+        index = get_collection_index(self.collections_dir)
+        # Re-saving an image that is already stored only adds a label record
+        sha256, path, _ = index.store.put(data, extension)
+        index.add_label(
+            sha256, path, job['save_class'], job['confidence'], source=job['source'],
+            created_at=job['created_at'], size=len(data),
+        )
+        return index.find_by_hash(sha256)
+
+    def flush(self):
+        """Block until every queued save has been written"""
+        self._queue.join()
+
+    def shutdown(self):
+        """Write everything still queued, then stop the workers"""
+        if self._closed:
+            return
+        self._closed = True
+        self.flush()
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join()
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def get_collection_writer(collections_dir=COLLECTIONS_DIR, policy=None):
+    """Return the process-wide CollectionWriter for a collections folder and policy
+    (by default the one configured with MONKEYPOX_STORAGE_POLICY)"""
+    policy = get_storage_policy(policy)
+    key = (os.path.abspath(collections_dir), policy.name)
+    with _writers_lock:
+        if key not in _writers:
+            _writers[key] = CollectionWriter(key[0], policy=policy)
+        return _writers[key]
+
+
+@atexit.register
+def _shutdown_writers():
+    """Flush pending saves when the process exits"""
+    with _writers_lock:
+        writers = list(_writers.values())
+    for writer in writers:
+        writer.shutdown()
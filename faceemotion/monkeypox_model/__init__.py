@@ -1,8 +1,33 @@
 """
 Monkeypox Model Package
 Deep learning model for monkeypox classification
+
+Names are imported on first use, so light modules such as mobile_runtime
+can be imported without pulling in torchvision.
 """
 
-from .monkeypox_configuration import MonkeypoxModel, MonkeypoxConfig
+import importlib
+
+_EXPORTS = {
+    'MonkeypoxModel': 'monkeypox_configuration',
+    'MonkeypoxConfig': 'monkeypox_configuration',
+    'ModelRegistry': 'registry',
+    'get_model': 'registry',
+    'get_model_registry': 'registry',
+    'InferenceBusyError': 'inference',
+    'InferenceExecutor': 'inference',
+    'get_inference_executor': 'inference',
+    'MobileModel': 'mobile_runtime',
+    'load_mobile_model': 'mobile_runtime',
+    'assess_quality': 'quality',
+}
+
+__all__ = list(_EXPORTS)
+
 
-__all__ = ['MonkeypoxModel', 'MonkeypoxConfig']
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{_EXPORTS[name]}', __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,207 @@
+"""
+Runtime Autotuner
+Benchmarks thread counts, backends (eager, TorchScript, int8 quantized) and
+batch sizes on the current host, and saves the fastest combination so
+MonkeypoxModel can apply it instead of per-deployment hand tuning.
+
+The saved configuration is tied to a host fingerprint (CPU count, machine,
+torch version, device) and to the weights file's modification time; on a
+different host or after new weights are deployed it is re-tuned. The
+thread count is the budget for the whole process: InferenceExecutor splits
+it across its workers.
+
+Usage (from the faceemotion folder):
+    python -m monkeypox_model.autotune           # tune and save
+    python -m monkeypox_model.autotune --show    # print the saved configuration
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import time
+from datetime import datetime
+
+import torch
+
+from .monkeypox_configuration import MonkeypoxConfig
+from .mobile_runtime import mobile_model_is_current
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+RUNTIME_CONFIG_PATH = os.path.join(PACKAGE_DIR, 'runtime_config.json')
+
+BACKENDS = ('eager', 'torchscript', 'quantized')
+BATCH_SIZES = (1, 4, 8, 16, 32)
+# A larger batch must be at least this much faster per image to be preferred
+BATCH_GAIN = 0.05
+
+
+def host_fingerprint(device):
+    """Describe what the measurements depend on"""
+    return {
+        'machine': platform.machine(),
+        'system': platform.system(),
+        'cpu_count': os.cpu_count() or 1,
+        'torch': torch.__version__,
+        'device': str(device),
+    }
+
+
+def load_runtime_config(device, path=RUNTIME_CONFIG_PATH):
+    """Return the saved configuration if it was tuned on this host, else None"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if config.get('host') != host_fingerprint(device):
+        return None
+    return config
+
+
+def save_runtime_config(config, path=RUNTIME_CONFIG_PATH):
+    """Write the configuration atomically"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(config, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def thread_candidates(cpu_count=None):
+    """Powers of two up to the CPU count, plus the CPU count itself"""
+    cpu_count = cpu_count or os.cpu_count() or 1
+    candidates = {cpu_count}
+    threads = 1
+    while threads < cpu_count:
+        candidates.add(threads)
+        threads *= 2
+    return sorted(candidates)
+
+
+def available_backends(model):
+    """Backends that can run on this host for the loaded model"""
+    backends = ['eager', 'torchscript']
+    # The int8 model is CPU-only and must be exported from the current weights
+    if model.device.type == 'cpu' and mobile_model_is_current(getattr(model, 'model_mtime', None)):
+        backends.append('quantized')
+    return backends
+
+
+def time_forward(runner, batch, repeats):
+    """Median seconds per forward pass after one warm-up pass"""
+    timings = []
+    with torch.no_grad():
+        runner(batch)
+        for _ in range(repeats):
+            start = time.perf_counter()
+            runner(batch)
+            if batch.device.type == 'cuda':
+                torch.cuda.synchronize()
+            timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def autotune(model, backends=None, batch_sizes=BATCH_SIZES, repeats=5, verbose=True):
+    """Benchmark the loaded MonkeypoxModel and return the best configuration.
+
+    Thread count and backend are chosen for single-image latency; the batch
+    size is then chosen for per-image throughput with that combination.
+    """
+    device = model.device
+    backends = [b for b in (backends or available_backends(model)) if b in BACKENDS]
+    threads = thread_candidates() if device.type == 'cpu' else [torch.get_num_threads()]
+    original_threads = torch.get_num_threads()
+    single = torch.rand(1, 3, *MonkeypoxConfig.IMAGE_SIZE, device=device)
+
+    measurements = []
+    best = None
+    try:
+        for backend in backends:
+            runner = model.build_runner(backend)
+            for count in threads:
+                torch.set_num_threads(count)
+                latency = time_forward(runner, single, repeats)
+                measurements.append({'backend': backend, 'threads': count, 'batch_size': 1,
+                                     'ms_per_image': latency * 1000})
+                if verbose:
+                    print(f"{backend:<12} threads={count:<3} {latency * 1000:8.1f} ms/image")
+                if best is None or latency < best[2]:
+                    best = (backend, count, latency)
+
+        backend, count, latency = best
+        runner = model.build_runner(backend)
+        torch.set_num_threads(count)
+        batch_size, per_image = 1, latency
+        for size in batch_sizes:
+            if size == 1:
+                continue
+            batch = torch.rand(size, 3, *MonkeypoxConfig.IMAGE_SIZE, device=device)
+            seconds = time_forward(runner, batch, max(2, repeats // 2)) / size
+            measurements.append({'backend': backend, 'threads': count, 'batch_size': size,
+                                 'ms_per_image': seconds * 1000})
+            if verbose:
+                print(f"{backend:<12} threads={count:<3} batch={size:<3} {seconds * 1000:8.1f} ms/image")
+            if seconds < per_image * (1 - BATCH_GAIN):
+                batch_size, per_image = size, seconds
+    finally:
+        torch.set_num_threads(original_threads)
+
+    return {
+        'host': host_fingerprint(device),
+        'weights_mtime': getattr(model, 'model_mtime', None),
+        'backend': backend,
+        'threads': count,
+        'batch_size': batch_size,
+        'latency_ms': latency * 1000,
+        'batch_ms_per_image': per_image * 1000,
+        'tuned_at': datetime.now().isoformat(timespec='seconds'),
+        'measurements': measurements,
+    }
+
+
+def tuned_config(model, path=RUNTIME_CONFIG_PATH):
+    """Return the saved configuration for this host and weights, tuning and saving it when missing"""
+    config = load_runtime_config(model.device, path)
+    if config is not None and config.get('weights_mtime') != getattr(model, 'model_mtime', None):
+        # New weights may invalidate the backend choice (e.g. a stale int8 export)
+        config = None
+    if config is None:
+        print("No runtime configuration for this host and weights; autotuning...")
+        config = autotune(model, verbose=False)
+        save_runtime_config(config, path)
+        print(f"Autotuned: {config['backend']}, {config['threads']} threads, batch size {config['batch_size']} "
+              f"({config['latency_ms']:.1f} ms/image)")
+    return config
+
+
+def main():
+    """Command-line entry point"""
+    from .registry import default_model_path
+    from .monkeypox_configuration import MonkeypoxModel
+
+    parser = argparse.ArgumentParser(description="Autotune inference threads, backend and batch size for this host")
+    parser.add_argument('--weights', default=None, help="Weights file (default: deployed best_model.pth)")
+    parser.add_argument('--output', default=RUNTIME_CONFIG_PATH)
+    parser.add_argument('--backends', nargs='+', choices=BACKENDS, default=None)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--show', action='store_true', help="Print the saved configuration and exit")
+    args = parser.parse_args()
+
+    model = MonkeypoxModel()
+    if args.show:
+        config = load_runtime_config(model.device, args.output)
+        print(json.dumps(config, indent=2) if config else "No configuration saved for this host.")
+        return
+
+    if not model.load_model(args.weights or default_model_path()):
+        raise SystemExit(1)
+    config = autotune(model, backends=args.backends, repeats=args.repeats)
+    save_runtime_config(config, args.output)
+    print(f"\n✅ Best: {config['backend']}, {config['threads']} threads, batch size {config['batch_size']} "
+          f"({config['latency_ms']:.1f} ms/image, {config['batch_ms_per_image']:.1f} ms/image batched)")
+    print(f"Saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Monkeypox Batch Size Probe
+Finds the largest training micro-batch that fits a memory budget, so a
+large effective batch can be reached with gradient accumulation.
+"""
+
+import argparse
+import math
+import os
+import subprocess
+import sys
+
+import torch
+import torch.nn as nn
+import torch.optim as optim
+from torchvision import models
+
+from .monkeypox_configuration import MonkeypoxConfig
+
+# Directory containing the monkeypox_model package, for probe subprocesses
+PARENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def build_training_model():
+    """Build the ResNet18 training architecture (weights do not affect memory)"""
+    model = models.resnet18(weights=None)
+    model.fc = nn.Linear(model.fc.in_features, MonkeypoxConfig.NUM_CLASSES)
+    return model
+
+
+def _training_step(model, optimizer, batch_size, device):
+    """Run one forward/backward/optimizer step on random data"""
+    images = torch.randn(batch_size, 3, *MonkeypoxConfig.IMAGE_SIZE, device=device)
+    labels = torch.randint(0, MonkeypoxConfig.NUM_CLASSES, (batch_size,), device=device)
+    loss = nn.functional.cross_entropy(model(images), labels)
+    loss.backward()
+    optimizer.step()
+    optimizer.zero_grad()
+
+
+def _rss_probe(batch_size):
+    """Run two training steps in this process and return its peak RSS in MB"""
+    import resource
+
+    model = build_training_model()
+    optimizer = optim.Adam(model.parameters(), lr=1e-4)
+    model.train()
+    # The second step includes the optimizer state allocated by the first
+    for _ in range(2):
+        _training_step(model, optimizer, batch_size, torch.device('cpu'))
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def measure_cpu_peak_mb(batch_size, timeout=600):
+    """Measure the peak RSS of one training step in a fresh interpreter.
+
+    A separate process is used because the CPU allocator keeps no resettable
+    high-water mark, and a failed probe must not bloat the training process.
+    """
+    try:
+        result = subprocess.run(
+            [sys.executable, '-m', 'monkeypox_model.batching', '--probe', str(batch_size)],
+            cwd=PARENT_DIR, capture_output=True, text=True, timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        return None
+    if result.returncode != 0:
+        return None
+    try:
+        return float(result.stdout.strip().splitlines()[-1])
+    except (IndexError, ValueError):
+        return None
+
+
+def measure_cuda_peak_mb(batch_size, device):
+    """Measure the allocator peak of one training step on a CUDA device"""
+    model = build_training_model().to(device)
+    optimizer = optim.Adam(model.parameters(), lr=1e-4)
+    model.train()
+    torch.cuda.empty_cache()
+    torch.cuda.reset_peak_memory_stats(device)
+    try:
+        for _ in range(2):
+            _training_step(model, optimizer, batch_size, device)
+        return torch.cuda.max_memory_allocated(device) / (1024 * 1024)
+    except torch.cuda.OutOfMemoryError:
+        return None
+    finally:
+        del model, optimizer
+        torch.cuda.empty_cache()
+
+
+def find_micro_batch_size(budget_mb, device, max_batch_size=256, headroom=0.9):
+    """Return the largest power-of-two micro-batch whose step fits the budget.
+
+    Only `headroom` of the budget is used, leaving room for data loading
+    and fragmentation. Returns 1 if even a single image does not fit.
+    Devices other than CUDA and CPU (e.g. MPS) keep no measurable peak, so
+    they are not probed and `max_batch_size` is returned.
+    """
+    if device.type not in ('cuda', 'cpu'):
+        print(f"Batch probe: cannot measure {device.type} memory; using micro-batch {max_batch_size}")
+        return max_batch_size
+    limit = budget_mb * headroom
+    best = 1
+    batch_size = 1
+    while batch_size <= max_batch_size:
+        if device.type == 'cuda':
+            peak = measure_cuda_peak_mb(batch_size, device)
+        else:
+            peak = measure_cpu_peak_mb(batch_size)
+        fits = peak is not None and peak <= limit
+        print(f"Batch probe: micro-batch {batch_size:4d} -> "
+              f"{'failed' if peak is None else f'{peak:.0f} MB'} ({'fits' if fits else 'over budget'})")
+        if not fits:
+            break
+        best = batch_size
+        batch_size *= 2
+    return best
+
+
+def accumulation_plan(effective_batch_size, micro_batch_size):
+    """Return (micro_batch_size, accumulation_steps) for a target effective batch"""
+    micro_batch_size = max(1, min(micro_batch_size, effective_batch_size))
+    steps = math.ceil(effective_batch_size / micro_batch_size)
+    # Spread the effective batch evenly over the steps (e.g. 100 -> 4 x 25, not 4 x 32)
+    return math.ceil(effective_batch_size / steps), steps
+
+
+def main():
+    """Probe entry point used by measure_cpu_peak_mb"""
+    parser = argparse.ArgumentParser(description="Measure peak RSS of one training step")
+    parser.add_argument('--probe', type=int, required=True, help="Micro-batch size to probe")
+    args = parser.parse_args()
+    print(_rss_probe(args.probe))
+
+
+if __name__ == "__main__":
+    main()
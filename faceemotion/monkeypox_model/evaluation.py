@@ -0,0 +1,260 @@
+"""
+Monkeypox Model Evaluation
+Runs the model over a dataset split once, caches raw logits and labels,
+and computes metrics vectorized from the cache.
+"""
+
+import argparse
+import hashlib
+import os
+
+import numpy as np
+import torch
+from torch.utils.data import DataLoader
+from torchvision import datasets
+
+from .monkeypox_configuration import MonkeypoxConfig, MonkeypoxModel
+
+# Default location of the logits cache, next to this package
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'eval_cache')
+
+# Index of the positive class ("Monkey Pox") in CLASS_NAMES / ImageFolder order
+POSITIVE_CLASS = 0
+
+
+def file_hash(path, chunk_size=1 << 20):
+    """Return a short SHA-256 hex digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def split_fingerprint(samples):
+    """Return a short digest of an ImageFolder sample list (paths, sizes, labels)"""
+    digest = hashlib.sha256()
+    for path, label in samples:
+        stat = os.stat(path)
+        digest.update(f"{path}\0{stat.st_size}\0{stat.st_mtime_ns}\0{label}\n".encode())
+    return digest.hexdigest()[:16]
+
+
+def cache_path(model_path, split_dir, cache_dir=CACHE_DIR):
+    """Return the cache file path for a (model weights, split) pair"""
+    parts = os.path.abspath(split_dir).split(os.sep)[-2:]
+    split_name = '_'.join(parts).replace(' ', '_')
+    return os.path.join(cache_dir, f"{file_hash(model_path)}_{split_name}.npz")
+
+
+def compute_logits(model, loader, device):
+    """Run a single forward pass over a loader and return (logits, labels) arrays"""
+    model.eval()
+    all_logits = []
+    all_labels = []
+    with torch.inference_mode():
+        for images, labels in loader:
+            all_logits.append(model(images.to(device)).float().cpu())
+            all_labels.append(labels)
+    logits = torch.cat(all_logits).numpy() if all_logits else np.empty((0, MonkeypoxConfig.NUM_CLASSES), np.float32)
+    labels = torch.cat(all_labels).numpy() if all_labels else np.empty((0,), np.int64)
+    return logits.astype(np.float32), labels.astype(np.int64)
+
+
+def load_or_compute_logits(model_path, split_dir, cache_dir=CACHE_DIR,
+                           batch_size=64, num_workers=0, refresh=False):
+    """Return cached (logits, labels, classes) for a split, computing them if needed.
+
+    The cache is keyed by the hash of the weights file and invalidated when
+    the split's file list changes.
+    """
+    wrapper = MonkeypoxModel()
+    dataset = datasets.ImageFolder(split_dir, transform=wrapper.transform)
+    fingerprint = split_fingerprint(dataset.samples)
+    path = cache_path(model_path, split_dir, cache_dir)
+
+    if not refresh and os.path.exists(path):
+        cached = np.load(path, allow_pickle=False)
+        if str(cached['fingerprint']) == fingerprint:
+            return cached['logits'], cached['labels'], [str(c) for c in cached['classes']]
+
+    if not wrapper.load_model(model_path):
+        raise RuntimeError(f"Could not load model weights from {model_path}")
+
+    loader = DataLoader(dataset, batch_size=batch_size, shuffle=False, num_workers=num_workers)
+    logits, labels = compute_logits(wrapper.model, loader, wrapper.device)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = path + '.tmp.npz'
+    np.savez_compressed(
+        tmp_path,
+        logits=logits,
+        labels=labels,
+        classes=np.array(dataset.classes),
+        fingerprint=np.array(fingerprint),
+    )
+    os.replace(tmp_path, path)
+    return logits, labels, list(dataset.classes)
+
+
+# === Vectorized metrics ===
+
+def softmax(logits):
+    """Numerically stable softmax over the last axis"""
+    shifted = logits - logits.max(axis=-1, keepdims=True)
+    exp = np.exp(shifted)
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+def confusion_matrix(labels, predictions, num_classes):
+    """Return a (num_classes, num_classes) matrix with true labels as rows"""
+    flat = labels * num_classes + predictions
+    return np.bincount(flat, minlength=num_classes * num_classes).reshape(num_classes, num_classes)
+
+
+def _binary_curve(scores, targets):
+    """Return cumulative TP/FP counts and thresholds at each distinct score"""
+    order = np.argsort(-scores, kind='mergesort')
+    scores = scores[order]
+    targets = targets[order]
+    # Keep only the last index of each run of equal scores
+    distinct = np.where(np.diff(scores))[0]
+    idx = np.r_[distinct, targets.size - 1]
+    tps = np.cumsum(targets)[idx]
+    fps = (idx + 1) - tps
+    return tps, fps, scores[idx]
+
+
+def roc_curve(scores, targets):
+    """Return (fpr, tpr, thresholds) for binary targets"""
+    tps, fps, thresholds = _binary_curve(scores, targets)
+    tps = np.r_[0, tps]
+    fps = np.r_[0, fps]
+    thresholds = np.r_[np.inf, thresholds]
+    positives = max(tps[-1], 1)
+    negatives = max(fps[-1], 1)
+    return fps / negatives, tps / positives, thresholds
+
+
+def roc_auc(scores, targets):
+    """Area under the ROC curve (trapezoidal rule)"""
+    fpr, tpr, _ = roc_curve(scores, targets)
+    return float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1]) / 2))
+
+
+def pr_curve(scores, targets):
+    """Return (precision, recall, thresholds) for binary targets"""
+    tps, fps, thresholds = _binary_curve(scores, targets)
+    precision = tps / np.maximum(tps + fps, 1)
+    recall = tps / max(tps[-1], 1)
+    return np.r_[1.0, precision], np.r_[0.0, recall], np.r_[np.inf, thresholds]
+
+
+def average_precision(scores, targets):
+    """Step-wise area under the precision-recall curve"""
+    precision, recall, _ = pr_curve(scores, targets)
+    return float(np.sum(np.diff(recall) * precision[1:]))
+
+
+def threshold_metrics(scores, targets, thresholds):
+    """Compute precision, recall, specificity, F1 and accuracy at many thresholds at once"""
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+    predicted = scores[None, :] >= thresholds[:, None]
+    targets = targets.astype(bool)[None, :]
+
+    tp = np.sum(predicted & targets, axis=1)
+    fp = np.sum(predicted & ~targets, axis=1)
+    fn = np.sum(~predicted & targets, axis=1)
+    tn = np.sum(~predicted & ~targets, axis=1)
+
+    precision = tp / np.maximum(tp + fp, 1)
+    recall = tp / np.maximum(tp + fn, 1)
+    specificity = tn / np.maximum(tn + fp, 1)
+    f1 = 2 * precision * recall / np.maximum(precision + recall, 1e-12)
+    accuracy = (tp + tn) / max(scores.size, 1)
+
+    return {
+        'threshold': thresholds,
+        'precision': precision,
+        'recall': recall,
+        'specificity': specificity,
+        'f1': f1,
+        'accuracy': accuracy,
+    }
+
+
+def compute_metrics(logits, labels, positive_class=POSITIVE_CLASS, thresholds=None):
+    """Compute the full metric set from cached logits and labels"""
+    num_classes = logits.shape[1]
+    probabilities = softmax(logits)
+    predictions = probabilities.argmax(axis=1)
+    scores = probabilities[:, positive_class]
+    targets = (labels == positive_class).astype(np.int64)
+
+    if thresholds is None:
+        thresholds = np.linspace(0.05, 0.95, 19)
+
+    return {
+        'num_samples': int(labels.size),
+        'accuracy': float(np.mean(predictions == labels)) if labels.size else 0.0,
+        'confusion_matrix': confusion_matrix(labels, predictions, num_classes),
+        'roc_auc': roc_auc(scores, targets),
+        'average_precision': average_precision(scores, targets),
+        'roc_curve': roc_curve(scores, targets),
+        'pr_curve': pr_curve(scores, targets),
+        'threshold_metrics': threshold_metrics(scores, targets, thresholds),
+    }
+
+
+def evaluate(model_path, split_dir, cache_dir=CACHE_DIR, refresh=False, **kwargs):
+    """Evaluate a model on a split, reusing cached logits when available"""
+    logits, labels, classes = load_or_compute_logits(
+        model_path, split_dir, cache_dir=cache_dir, refresh=refresh, **kwargs
+    )
+    metrics = compute_metrics(logits, labels)
+    metrics['classes'] = classes
+    return metrics
+
+
+def print_report(metrics):
+    """Print a human-readable evaluation report"""
+    classes = metrics['classes']
+    print(f"Samples: {metrics['num_samples']}")
+    print(f"Accuracy: {100 * metrics['accuracy']:.2f}%")
+    print(f"ROC-AUC ({classes[POSITIVE_CLASS]}): {metrics['roc_auc']:.4f}")
+    print(f"Average precision ({classes[POSITIVE_CLASS]}): {metrics['average_precision']:.4f}")
+
+    print("Confusion matrix (rows = true, cols = predicted):")
+    width = max(len(c) for c in classes)
+    print(" " * (width + 2) + "  ".join(f"{c:>{width}}" for c in classes))
+    for name, row in zip(classes, metrics['confusion_matrix']):
+        print(f"{name:>{width}}  " + "  ".join(f"{v:>{width}}" for v in row))
+
+    print("Threshold  Precision  Recall  Specificity  F1      Accuracy")
+    table = metrics['threshold_metrics']
+    for i, t in enumerate(table['threshold']):
+        print(f"{t:9.2f}  {table['precision'][i]:9.3f}  {table['recall'][i]:6.3f}  "
+              f"{table['specificity'][i]:11.3f}  {table['f1'][i]:6.3f}  {table['accuracy'][i]:8.3f}")
+
+
+def main():
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Evaluate a Monkeypox model on a dataset split")
+    parser.add_argument('--model', default=MonkeypoxConfig.MODEL_PATH, help="Path to model weights")
+    parser.add_argument('--split', default=os.path.join('monkeypox_data', 'test'), help="ImageFolder split directory")
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help="Directory for cached logits")
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--num-workers', type=int, default=0)
+    parser.add_argument('--refresh', action='store_true', help="Ignore the cache and run a new forward pass")
+    args = parser.parse_args()
+
+    metrics = evaluate(
+        args.model, args.split,
+        cache_dir=args.cache_dir, refresh=args.refresh,
+        batch_size=args.batch_size, num_workers=args.num_workers,
+    )
+    print_report(metrics)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+Monkeypox Incremental Fine-Tuning
+Warm-starts from the current model and fine-tunes on images that users
+confirmed into the collections since the last run, mixed with a replay
+sample of the original training data.
+
+New images are found through the collections index and tracked in the
+manifest by content hash, so relabelled images are picked up again.
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+from datetime import datetime
+
+import torch
+import torch.nn as nn
+import torch.optim as optim
+from PIL import Image
+from torch.utils.data import DataLoader, Dataset
+from torchvision import datasets
+
+from monkeypox_collections import get_collection_index
+
+from .monkeypox_configuration import MonkeypoxConfig, MonkeypoxModel
+from .evaluation import evaluate
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.join(PACKAGE_DIR, '..', '..')
+
+COLLECTIONS_DIR = os.path.join(PACKAGE_DIR, '..', 'app', 'collections')
+TRAIN_DIR = os.path.join(PROJECT_DIR, 'monkeypox_data', 'train')
+TEST_DIR = os.path.join(PROJECT_DIR, 'monkeypox_data', 'test')
+BASE_MODEL_PATH = os.path.join(PACKAGE_DIR, 'best_model.pth')
+VERSIONS_DIR = os.path.join(PACKAGE_DIR, 'versions')
+MANIFEST_PATH = os.path.join(VERSIONS_DIR, 'finetune_manifest.json')
+
+
+class LabeledImageDataset(Dataset):
+    """Dataset over an explicit list of (path, label) pairs"""
+
+    def __init__(self, samples, transform):
+        self.samples = samples
+        self.transform = transform
+
+    def __len__(self):
+        return len(self.samples)
+
+    def __getitem__(self, index):
+        path, label = self.samples[index]
+        with Image.open(path) as image:
+            image = image.convert("RGB")
+        return self.transform(image), label
+
+
+def load_manifest(path=MANIFEST_PATH):
+    """Load the fine-tuning manifest, or return an empty one"""
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {'seen': {}, 'versions': []}
+
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    """Atomically write the fine-tuning manifest"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def scan_collections(collections_dir=COLLECTIONS_DIR):
+    """Return {sha256: (absolute_path, label)} for every labelled collection image"""
+    index = get_collection_index(collections_dir)
+    found = {}
+    for row in index.iter_objects():
+        if row['class_name'] in MonkeypoxConfig.CLASS_NAMES:
+            label = MonkeypoxConfig.CLASS_NAMES.index(row['class_name'])
+            found[row['sha256']] = (index.absolute_path(row['path']), label)
+    return found
+
+
+def find_new_samples(manifest, collections_dir=COLLECTIONS_DIR):
+    """Return collection images added (or relabelled) since the last run"""
+    new = {}
+    for sha256, (path, label) in scan_collections(collections_dir).items():
+        seen = manifest['seen'].get(sha256)
+        if seen is None or seen['label'] != label:
+            new[sha256] = (path, label)
+    return new
+
+
+def replay_samples(count, train_dir=TRAIN_DIR, seed=None):
+    """Draw a class-balanced random sample of the original training data"""
+    samples = datasets.ImageFolder(train_dir).samples
+    by_label = {}
+    for path, label in samples:
+        by_label.setdefault(label, []).append((path, label))
+
+    rng = random.Random(seed)
+    per_class = max(1, count // max(len(by_label), 1))
+    replay = []
+    for items in by_label.values():
+        replay.extend(rng.sample(items, min(per_class, len(items))))
+    rng.shuffle(replay)
+    return replay
+
+
+def current_model_path(manifest, base_model_path=BASE_MODEL_PATH):
+    """Return the weights the next run should warm-start from"""
+    if manifest['versions']:
+        latest = os.path.join(VERSIONS_DIR, manifest['versions'][-1]['file'])
+        if os.path.exists(latest):
+            return latest
+    return base_model_path
+
+
+def finetune(model, loader, device, epochs, lr):
+    """Fine-tune a model in place and return the mean loss of the last epoch"""
+    criterion = nn.CrossEntropyLoss()
+    optimizer = optim.Adam(model.parameters(), lr=lr)
+    epoch_loss = 0.0
+    for epoch in range(epochs):
+        model.train()
+        running_loss = 0.0
+        for images, labels in loader:
+            images, labels = images.to(device), labels.to(device)
+            optimizer.zero_grad()
+            loss = criterion(model(images), labels)
+            loss.backward()
+            optimizer.step()
+            running_loss += loss.item()
+        epoch_loss = running_loss / max(len(loader), 1)
+        print(f"Epoch {epoch+1}/{epochs} | Train Loss: {epoch_loss:.4f}")
+    return epoch_loss
+
+
+def run(epochs=3, lr=1e-5, batch_size=16, replay_ratio=2.0, min_new=1,
+        tolerance=0.01, promote=True, seed=None, collections_dir=COLLECTIONS_DIR):
+    """Run one incremental fine-tuning job. Returns the new version entry or None."""
+    manifest = load_manifest()
+    new = find_new_samples(manifest, collections_dir)
+    if len(new) < min_new:
+        print(f"Only {len(new)} new collection image(s); nothing to do.")
+        return None
+
+    start_path = current_model_path(manifest)
+    wrapper = MonkeypoxModel()
+    if not wrapper.load_model(start_path):
+        raise RuntimeError(f"Could not load starting weights from {start_path}")
+
+    new_samples = list(new.values())
+    replay = replay_samples(int(len(new_samples) * replay_ratio), seed=seed)
+    print(f"Fine-tuning on {len(new_samples)} new + {len(replay)} replay images from {start_path}")
+
+    dataset = LabeledImageDataset(new_samples + replay, wrapper.transform)
+    loader = DataLoader(dataset, batch_size=batch_size, shuffle=True)
+    train_loss = finetune(wrapper.model, loader, wrapper.device, epochs, lr)
+
+    os.makedirs(VERSIONS_DIR, exist_ok=True)
+    version = len(manifest['versions']) + 1
+    filename = f"model_v{version:03d}.pth"
+    candidate_path = os.path.join(VERSIONS_DIR, filename)
+    torch.save(wrapper.model.state_dict(), candidate_path + '.tmp')
+    os.replace(candidate_path + '.tmp', candidate_path)
+
+    # Gate publication on the held-out test split so a bad batch of labels
+    # cannot silently degrade the deployed model
+    baseline_accuracy = evaluate(start_path, TEST_DIR)['accuracy']
+    candidate_accuracy = evaluate(candidate_path, TEST_DIR)['accuracy']
+    print(f"Test Accuracy: {100 * baseline_accuracy:.2f}% -> {100 * candidate_accuracy:.2f}%")
+    if candidate_accuracy + tolerance < baseline_accuracy:
+        os.remove(candidate_path)
+        print("⚠️ Candidate is worse than the current model; not published.")
+        return None
+
+    entry = {
+        'version': version,
+        'file': filename,
+        'parent': os.path.basename(start_path),
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'new_images': len(new_samples),
+        'replay_images': len(replay),
+        'train_loss': train_loss,
+        'test_accuracy': candidate_accuracy,
+    }
+    manifest['versions'].append(entry)
+    for sha256, (_, label) in new.items():
+        manifest['seen'][sha256] = {'label': label}
+    save_manifest(manifest)
+
+    if promote:
+        # Keep the original weights around before the first promotion
+        original = os.path.join(VERSIONS_DIR, 'model_v000.pth')
+        if os.path.exists(BASE_MODEL_PATH) and not os.path.exists(original):
+            shutil.copy2(BASE_MODEL_PATH, original)
+        shutil.copy2(candidate_path, BASE_MODEL_PATH + '.tmp')
+        os.replace(BASE_MODEL_PATH + '.tmp', BASE_MODEL_PATH)
+
+    print(f"✅ Published {filename}")
+    return entry
+
+
+def main():
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Incrementally fine-tune on new collection images")
+    parser.add_argument('--epochs', type=int, default=3)
+    parser.add_argument('--lr', type=float, default=1e-5)
+    parser.add_argument('--batch-size', type=int, default=16)
+    parser.add_argument('--replay-ratio', type=float, default=2.0,
+                        help="Replay images drawn from the original training set per new image")
+    parser.add_argument('--min-new', type=int, default=1, help="Skip the run if fewer new images exist")
+    parser.add_argument('--tolerance', type=float, default=0.01,
+                        help="Allowed test accuracy drop before a candidate is rejected")
+    parser.add_argument('--no-promote', action='store_true',
+                        help=f"Publish the version without replacing {os.path.basename(BASE_MODEL_PATH)}")
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    run(
+        epochs=args.epochs, lr=args.lr, batch_size=args.batch_size,
+        replay_ratio=args.replay_ratio, min_new=args.min_new,
+        tolerance=args.tolerance, promote=not args.no_promote, seed=args.seed,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+"""
+Image Helpers
+Small PIL helpers shared by the models, the quality gate and the
+collections package. Needs only PIL, so the mobile runtime can use it.
+"""
+
+from PIL import Image
+
+
+def flatten_to_rgb(image):
+    """Convert an image to RGB, compositing transparency onto white"""
+    if image.mode in ('RGBA', 'LA', 'P'):
+        if image.mode == 'P':
+            image = image.convert('RGBA')
+        rgb_image = Image.new('RGB', image.size, (255, 255, 255))
+        rgb_image.paste(image, mask=image.split()[-1])
+        return rgb_image
+    if image.mode != 'RGB':
+        return image.convert('RGB')
+    return image
@@ -0,0 +1,124 @@
+"""
+Inference Executor
+Bounded worker pool that serializes model calls from concurrent Streamlit
+sessions, so CPU threads are not oversubscribed and overload turns into a
+quick "busy" response instead of unbounded latency.
+"""
+
+import os
+import queue
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+import torch
+
+from .registry import default_model_path, get_model
+
+NUM_WORKERS = 2
+MAX_PENDING = 8
+SUBMIT_TIMEOUT = 2.0
+RESULT_TIMEOUT = 30.0
+
+
+class InferenceBusyError(Exception):
+    """Raised when the executor cannot take or finish a request in time"""
+
+
+class InferenceExecutor:
+    """Fixed pool of inference workers fed by a bounded queue.
+
+    Each worker limits torch to `threads_per_worker` intra-op threads. By
+    default the model's autotuned thread count (or the core count if it
+    was not tuned) is split across the workers, so all workers together
+    stay within that budget. Requests wait at
+    most `submit_timeout` seconds for a queue slot and `result_timeout`
+    seconds for their result before InferenceBusyError is raised.
+    """
+
+    def __init__(self, model_path=None, num_workers=NUM_WORKERS, threads_per_worker=None,
+                 max_pending=MAX_PENDING, submit_timeout=SUBMIT_TIMEOUT, result_timeout=RESULT_TIMEOUT):
+        self.model_path = model_path
+        self.num_workers = num_workers
+        self.threads_per_worker = threads_per_worker
+        self.submit_timeout = submit_timeout
+        self.result_timeout = result_timeout
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._workers = [
+            threading.Thread(target=self._run, name=f"inference-worker-{i}", daemon=True)
+            for i in range(num_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    @property
+    def pending(self):
+        """Number of requests waiting for a worker"""
+        return self._queue.qsize()
+
+    def submit(self, method, *args):
+        """Queue a call to a MonkeypoxModel method and return its Future"""
+        future = Future()
+        try:
+            self._queue.put((method, args, future), timeout=self.submit_timeout)
+        except queue.Full:
+            raise InferenceBusyError("The analysis service is busy; please retry in a moment.")
+        return future
+
+    def _call(self, method, *args):
+        future = self.submit(method, *args)
+        try:
+            return future.result(timeout=self.result_timeout)
+        except FutureTimeoutError:
+            # Drop the request if no worker has picked it up yet
+            future.cancel()
+            raise InferenceBusyError("The analysis took too long; please retry in a moment.")
+
+    def predict(self, image):
+        """Classify one image on a worker and return the prediction dict"""
+        return self._call('predict', image)
+
+    def predict_batch(self, images, batch_size=None):
+        """Classify a list of images on a worker and return the prediction dicts
+        (batch_size defaults to the model's tuned batch size)"""
+        return self._call('predict_batch', images, batch_size)
+
+    def worker_threads(self, model):
+        """Intra-op threads for each worker running the given model"""
+        if self.threads_per_worker:
+            return self.threads_per_worker
+        config = getattr(model, 'runtime_config', None)
+        total = config['threads'] if config else os.cpu_count() or 1
+        return max(1, total // self.num_workers)
+
+    def _run(self):
+        while True:
+            method, args, future = self._queue.get()
+            try:
+                if future.set_running_or_notify_cancel():
+                    try:
+                        model = get_model(self.model_path)
+                        if model is None:
+                            raise RuntimeError("Classification model is not available")
+                        # The intra-op thread count is process-wide in PyTorch and
+                        # loading a model applies its tuned count; set it per call
+                        threads = self.worker_threads(model)
+                        if torch.get_num_threads() != threads:
+                            torch.set_num_threads(threads)
+                        future.set_result(getattr(model, method)(*args))
+                    except Exception as e:
+                        future.set_exception(e)
+            finally:
+                self._queue.task_done()
+
+
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def get_inference_executor(model_path=None):
+    """Return the process-wide InferenceExecutor for a weights file"""
+    key = os.path.abspath(model_path or default_model_path())
+    with _executors_lock:
+        if key not in _executors:
+            _executors[key] = InferenceExecutor(key)
+        return _executors[key]
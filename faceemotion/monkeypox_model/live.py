@@ -0,0 +1,131 @@
+"""
+Live Frame Analyzer
+Classifies a stream of video frames on a background thread. Only the most
+recent frame is kept, near-identical frames are skipped and predictions
+are smoothed, so CPU use stays bounded regardless of the camera frame rate.
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from .monkeypox_configuration import MonkeypoxConfig
+
+SIGNATURE_SIZE = (32, 32)
+
+
+def frame_signature(image):
+    """Return a tiny grayscale copy of a frame for cheap change detection"""
+    return np.asarray(image.convert('L').resize(SIGNATURE_SIZE), dtype=np.float32)
+
+
+class LiveAnalyzer:
+    """Latest-frame-wins analyzer with change detection and smoothing.
+
+    predict:        callable taking a PIL image and returning a prediction dict
+    min_interval:   minimum seconds between predictions
+    diff_threshold: mean absolute gray-level change below which a frame is skipped
+    smoothing:      weight of each new prediction in the moving average (0-1]
+    idle_timeout:   seconds without frames after which the thread exits; the
+                    next submit() starts it again, so abandoned streams do not
+                    keep threads alive
+    """
+
+    def __init__(self, predict, min_interval=0.25, diff_threshold=3.0, smoothing=0.3, idle_timeout=30.0):
+        self._predict = predict
+        self.min_interval = min_interval
+        self.diff_threshold = diff_threshold
+        self.smoothing = smoothing
+        self.idle_timeout = idle_timeout
+        self._condition = threading.Condition()
+        self._frame = None
+        self._signature = None
+        self._probabilities = None
+        self._stopped = False
+        self.stats = {'submitted': 0, 'dropped': 0, 'similar': 0, 'analyzed': 0, 'rejected': 0, 'failed': 0}
+        self._thread = None
+
+    def submit(self, image):
+        """Offer a frame; it replaces any frame still waiting to be analyzed"""
+        with self._condition:
+            if self._stopped:
+                return
+            if self._frame is not None:
+                self.stats['dropped'] += 1
+            self._frame = image
+            self.stats['submitted'] += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="live-analyzer", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def prediction(self):
+        """Return the smoothed prediction dict, or None before the first result"""
+        with self._condition:
+            probabilities = self._probabilities
+        if probabilities is None:
+            return None
+        index = int(np.argmax(probabilities))
+        return {
+            'predicted_class': MonkeypoxConfig.CLASS_NAMES[index],
+            'confidence': float(probabilities[index]),
+            'probabilities': dict(zip(MonkeypoxConfig.CLASS_NAMES, probabilities.tolist())),
+        }
+
+    def stop(self, timeout=None):
+        """Stop the background thread; later frames are ignored.
+
+        By default this returns at once and a prediction still in flight
+        finishes on the daemon thread; pass a timeout to wait for it.
+        """
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+            thread = self._thread
+        if thread is not None and timeout is not None:
+            thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._frame is None and not self._stopped:
+                    if not self._condition.wait(self.idle_timeout) and self._frame is None:
+                        self._thread = None
+                        return
+                if self._stopped:
+                    return
+                image, self._frame = self._frame, None
+
+            started = time.perf_counter()
+            signature = frame_signature(image)
+            if self._signature is not None and np.abs(signature - self._signature).mean() < self.diff_threshold:
+                self.stats['similar'] += 1
+                continue
+
+            try:
+                result = self._predict(image)
+            except Exception:
+                # A busy executor or a bad frame just means this frame is skipped
+                self.stats['failed'] += 1
+            else:
+                self._signature = signature
+                if result['predicted_class'] is None:
+                    # Blurry or badly exposed frames do not move the average
+                    self.stats['rejected'] += 1
+                else:
+                    self._update(result['probabilities'])
+                    self.stats['analyzed'] += 1
+
+            # Cap the prediction rate; frames arriving meanwhile collapse into one
+            remaining = self.min_interval - (time.perf_counter() - started)
+            if remaining > 0:
+                time.sleep(remaining)
+
+    def _update(self, probabilities):
+        new = np.array([probabilities[name] for name in MonkeypoxConfig.CLASS_NAMES], dtype=np.float32)
+        with self._condition:
+            if self._probabilities is None:
+                self._probabilities = new
+            else:
+                self._probabilities = (1 - self.smoothing) * self._probabilities + self.smoothing * new
@@ -0,0 +1,199 @@
+"""
+Mobile Model Export
+Builds the compact model shipped in the APK: an int8 statically quantized
+ResNet18, frozen and optimized as TorchScript, with its class names and
+input size embedded. Also measures package size, load time, per-image
+latency and agreement with the full model, and writes them to a report.
+
+Usage (from the faceemotion folder):
+    python -m monkeypox_model.mobile_export --calibration ../monkeypox_data/train
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+
+import torch
+import torch.nn as nn
+from torch.utils.mobile_optimizer import optimize_for_mobile
+from torchvision.models.quantization import resnet18 as quantizable_resnet18
+
+from .monkeypox_configuration import MonkeypoxConfig, MonkeypoxModel
+from .mobile_runtime import METADATA_FILENAME, MOBILE_MODEL_PATH, load_mobile_model
+from .registry import default_model_path
+from .shards import find_samples
+
+# qnnpack is the int8 backend used on ARM phones
+DEFAULT_BACKEND = 'qnnpack'
+
+
+def sample_images(root, count, seed=0):
+    """Return up to `count` random image paths from class folders below root"""
+    paths = [path for path, _ in find_samples(root)]
+    random.Random(seed).shuffle(paths)
+    return paths[:count]
+
+
+def metadata(backend, quantized):
+    """Describe the artifact for the runtime loader"""
+    return {
+        'class_names': MonkeypoxConfig.CLASS_NAMES,
+        'image_size': list(MonkeypoxConfig.IMAGE_SIZE),
+        'quantized_engine': backend if quantized else None,
+    }
+
+
+def optimize(scripted):
+    """Freeze a traced module and apply the mobile passes when this torch build has them"""
+    frozen = torch.jit.freeze(scripted)
+    try:
+        return optimize_for_mobile(frozen)
+    except RuntimeError as e:
+        # Desktop builds without XNNPACK cannot run the mobile rewrite passes
+        print(f"⚠️ Mobile optimization unavailable, saving frozen model only: {str(e).splitlines()[0]}")
+        return frozen
+
+
+def build_float(model):
+    """Freeze the float model as mobile-optimized TorchScript"""
+    example = torch.zeros(1, 3, *MonkeypoxConfig.IMAGE_SIZE)
+    scripted = torch.jit.trace(model.model.cpu().eval(), example)
+    return optimize(scripted)
+
+
+def build_quantized(model, calibration_paths, backend=DEFAULT_BACKEND):
+    """Statically quantize the model to int8, calibrating on sample images"""
+    torch.backends.quantized.engine = backend
+    quantizable = quantizable_resnet18(weights=None, quantize=False)
+    quantizable.fc = nn.Linear(quantizable.fc.in_features, MonkeypoxConfig.NUM_CLASSES)
+    quantizable.load_state_dict(model.model.cpu().state_dict())
+    quantizable.eval()
+    quantizable.fuse_model()
+    quantizable.qconfig = torch.ao.quantization.get_default_qconfig(backend)
+    torch.ao.quantization.prepare(quantizable, inplace=True)
+
+    # Observers record activation ranges from real images
+    with torch.no_grad():
+        for path in calibration_paths:
+            quantizable(model.preprocess_image(path))
+    torch.ao.quantization.convert(quantizable, inplace=True)
+
+    example = torch.zeros(1, 3, *MonkeypoxConfig.IMAGE_SIZE)
+    scripted = torch.jit.trace(quantizable, example)
+    return optimize(scripted)
+
+
+def save_artifact(module, path, info):
+    """Save TorchScript with its metadata embedded as an extra file"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + '.tmp'
+    torch.jit.save(module, tmp_path, _extra_files={METADATA_FILENAME: json.dumps(info)})
+    os.replace(tmp_path, path)
+
+
+def median_latency_ms(predict, image_paths, repeats=20):
+    """Median single-image prediction time in milliseconds, after one warm-up call"""
+    predict(image_paths[0])
+    timings = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        predict(image_paths[i % len(image_paths)])
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def measure(name, path, load, eval_paths, reference):
+    """Size, load time, latency and agreement with the reference predictions"""
+    start = time.perf_counter()
+    model = load()
+    load_seconds = time.perf_counter() - start
+    predictions = [model.predict(p)['predicted_class'] for p in eval_paths]
+    agreement = sum(a == b for a, b in zip(predictions, reference)) / max(len(reference), 1)
+    return {
+        'variant': name,
+        'path': os.path.relpath(path),
+        'size_mb': os.path.getsize(path) / (1024 * 1024),
+        'load_seconds': load_seconds,
+        'latency_ms': median_latency_ms(model.predict, eval_paths),
+        'agreement': agreement,
+    }
+
+
+def print_report(rows):
+    """Print the comparison table"""
+    print(f"\n{'Variant':<12} {'Size (MB)':>10} {'Load (s)':>9} {'Latency (ms)':>13} {'Agreement':>10}")
+    for row in rows:
+        print(f"{row['variant']:<12} {row['size_mb']:>10.1f} {row['load_seconds']:>9.2f} "
+              f"{row['latency_ms']:>13.1f} {row['agreement']:>10.1%}")
+
+
+def export(weights=None, output=MOBILE_MODEL_PATH, calibration_dir=None, eval_dir=None,
+           calibration_count=64, eval_count=32, backend=DEFAULT_BACKEND, quantize=True):
+    """Build the mobile artifact and return the measurement report"""
+    weights = weights or default_model_path()
+    model = MonkeypoxModel()
+    if not model.load_model(weights):
+        raise RuntimeError(f"Could not load weights from {weights}")
+    model.model = model.model.cpu()
+    model.device = torch.device('cpu')
+
+    if quantize:
+        if not calibration_dir:
+            raise ValueError("Quantization needs --calibration images")
+        calibration_paths = sample_images(calibration_dir, calibration_count)
+        print(f"Calibrating int8 model ({backend}) on {len(calibration_paths)} images...")
+        module = build_quantized(model, calibration_paths, backend)
+    else:
+        module = build_float(model)
+    save_artifact(module, output, metadata(backend, quantize))
+    print(f"✅ Saved {output}")
+
+    eval_paths = sample_images(eval_dir or calibration_dir, eval_count, seed=1) if (eval_dir or calibration_dir) else []
+    if not eval_paths:
+        print("No evaluation images given; skipping measurements.")
+        return None
+
+    reference = [model.predict(p)['predicted_class'] for p in eval_paths]
+    rows = [
+        measure('full', weights, lambda: MonkeypoxModel(weights), eval_paths, reference),
+        measure('mobile', output, lambda: load_mobile_model(output), eval_paths, reference),
+    ]
+    report = {
+        'weights': os.path.relpath(weights),
+        'quantized': quantize,
+        'backend': backend if quantize else None,
+        'eval_images': len(eval_paths),
+        'threads': torch.get_num_threads(),
+        'variants': rows,
+    }
+    with open(os.path.splitext(output)[0] + '_report.json', 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print_report(rows)
+    return report
+
+
+def main():
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Build the compact mobile model for the APK")
+    parser.add_argument('--weights', default=None, help="Float weights (default: deployed best_model.pth)")
+    parser.add_argument('--output', default=MOBILE_MODEL_PATH)
+    parser.add_argument('--calibration', default=None, help="Folder of class-named image folders for calibration")
+    parser.add_argument('--eval', default=None, help="Folder of images for measurements (default: calibration folder)")
+    parser.add_argument('--calibration-count', type=int, default=64)
+    parser.add_argument('--eval-count', type=int, default=32)
+    parser.add_argument('--backend', default=DEFAULT_BACKEND, choices=torch.backends.quantized.supported_engines)
+    parser.add_argument('--no-quantize', action='store_true', help="Export float TorchScript only")
+    args = parser.parse_args()
+
+    export(
+        weights=args.weights, output=args.output, calibration_dir=args.calibration,
+        eval_dir=args.eval, calibration_count=args.calibration_count, eval_count=args.eval_count,
+        backend=args.backend, quantize=not args.no_quantize,
+    )
+
+
+if __name__ == "__main__":
+    main()
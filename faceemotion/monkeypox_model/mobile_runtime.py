@@ -0,0 +1,115 @@
+"""
+Mobile Model Runtime
+Minimal loader for the exported mobile model. Needs only torch, PIL and
+numpy, so the APK does not have to import torchvision or the training code.
+"""
+
+import json
+import os
+
+import numpy as np
+import torch
+from PIL import Image
+
+from .imaging import flatten_to_rgb
+from .quality import assess_quality, rejected_result
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+MOBILE_MODEL_PATH = os.path.join(PACKAGE_DIR, 'mobile_model.pt')
+METADATA_FILENAME = 'metadata.json'
+
+
+class MobileModel:
+    """TorchScript classification model with the same predict() results as MonkeypoxModel"""
+
+    def __init__(self, module, class_names, image_size, quality_check=True):
+        self.module = module
+        self.class_names = list(class_names)
+        self.image_size = tuple(image_size)
+        self.quality_check = quality_check
+
+    def preprocess_image(self, image):
+        """Convert a PIL image or file path to a 1x3xHxW float tensor in [0, 1]"""
+        if isinstance(image, str):
+            image = Image.open(image)
+        elif not isinstance(image, Image.Image):
+            raise ValueError("Image must be PIL Image or file path")
+
+        # White background for transparent images, as in MonkeypoxModel
+        image = flatten_to_rgb(image)
+
+        # PIL takes (width, height); the configured size is (height, width)
+        resized = image.resize(self.image_size[::-1], Image.BILINEAR)
+        array = np.asarray(resized, dtype=np.float32) / 255.0
+        return torch.from_numpy(array.transpose(2, 0, 1).copy()).unsqueeze(0)
+
+    def check_quality(self, image):
+        """Return the image (opened if given a path) and its quality report, or None if disabled"""
+        if isinstance(image, str):
+            image = Image.open(image)
+        if not self.quality_check or not isinstance(image, Image.Image):
+            return image, None
+        return image, assess_quality(image)
+
+    def predict(self, image):
+        """Make prediction on input image"""
+        # Images that fail the quality gate skip the forward pass
+        image, quality = self.check_quality(image)
+        if quality is not None and quality['status'] == 'rejected':
+            return rejected_result(quality)
+        with torch.no_grad():
+            probabilities = torch.softmax(self.module(self.preprocess_image(image)), dim=1)[0]
+        return self._format_prediction(probabilities, quality)
+
+    def predict_batch(self, images, batch_size=16):
+        """Make predictions on a list of images using batched forward passes"""
+        checked = [self.check_quality(image) for image in images]
+        results = [
+            rejected_result(quality) if quality is not None and quality['status'] == 'rejected' else None
+            for _, quality in checked
+        ]
+        accepted = [i for i, result in enumerate(results) if result is None]
+        for start in range(0, len(accepted), batch_size):
+            chunk = accepted[start:start + batch_size]
+            input_tensor = torch.cat([self.preprocess_image(checked[i][0]) for i in chunk])
+            with torch.no_grad():
+                probabilities = torch.softmax(self.module(input_tensor), dim=1)
+            for i, row in zip(chunk, probabilities):
+                results[i] = self._format_prediction(row, checked[i][1])
+        return results
+
+    def _format_prediction(self, probabilities, quality=None):
+        """Build the prediction dict for one row of class probabilities"""
+        index = int(torch.argmax(probabilities))
+        result = {
+            'predicted_class': self.class_names[index],
+            'confidence': probabilities[index].item(),
+            'probabilities': {
+                class_name: prob.item()
+                for class_name, prob in zip(self.class_names, probabilities)
+            }
+        }
+        if quality is not None:
+            result['quality'] = quality
+        return result
+
+
+def mobile_model_is_current(weights_mtime, model_path=MOBILE_MODEL_PATH):
+    """True if the exported model exists and is not older than the weights it was built from"""
+    if not os.path.exists(model_path):
+        return False
+    return weights_mtime is None or os.path.getmtime(model_path) >= weights_mtime
+
+
+def load_mobile_model(model_path=MOBILE_MODEL_PATH):
+    """Load an exported mobile model; raises if the file is missing or invalid"""
+    extra_files = {METADATA_FILENAME: ''}
+    module = torch.jit.load(model_path, map_location='cpu', _extra_files=extra_files)
+    info = json.loads(extra_files[METADATA_FILENAME])
+
+    # The int8 kernels must match the backend the model was quantized for
+    engine = info.get('quantized_engine')
+    if engine and engine in torch.backends.quantized.supported_engines:
+        torch.backends.quantized.engine = engine
+    module.eval()
+    return MobileModel(module, info['class_names'], info['image_size'])
@@ -9,6 +9,10 @@ from torchvision import models, transforms
 from PIL import Image
 import os
 
+from .mobile_runtime import MOBILE_MODEL_PATH, load_mobile_model, mobile_model_is_current
+from .imaging import flatten_to_rgb
+from .quality import assess_quality, rejected_result
+
 class MonkeypoxConfig:
     """Configuration class for Monkeypox model"""
     
@@ -21,6 +25,12 @@ class MonkeypoxConfig:
     # Model path
     MODEL_PATH = "best_model.pth"
     
+    # Batch size used by predict_batch until a tuned runtime config sets one
+    BATCH_SIZE = 16
+    
+    # Check blur, exposure and resolution before inference (see quality.py)
+    QUALITY_CHECK = True
+    
     # Device configuration
     @staticmethod
     def get_device():
@@ -39,6 +49,11 @@ class MonkeypoxModel:
         self.config = MonkeypoxConfig()
         self.device = self.config.get_device()
         self.model = None
+        # What inference calls: the model itself or a compiled variant of it
+        self.runner = None
+        self.batch_size = self.config.BATCH_SIZE
+        self.runtime_config = None
+        self.quality_check = self.config.QUALITY_CHECK
         self.transform = self._get_transform()
         
         if model_path:
@@ -62,6 +77,8 @@ class MonkeypoxModel:
             self.model.load_state_dict(torch.load(model_path, map_location=self.device))
             self.model = self.model.to(self.device)
             self.model.eval()
+            self.runner = self.model
+            self.model_mtime = os.path.getmtime(model_path)
             
             print(f"Model loaded successfully from {model_path}")
             return True
@@ -70,6 +87,38 @@ class MonkeypoxModel:
             print(f"Error loading model: {e}")
             return False
     
+    def build_runner(self, backend):
+        """Return a callable running the loaded model with the given backend"""
+        if backend == 'eager':
+            return self.model
+        if backend == 'torchscript':
+            example = torch.zeros(1, 3, *self.config.IMAGE_SIZE, device=self.device)
+            with torch.no_grad():
+                return torch.jit.freeze(torch.jit.trace(self.model, example))
+        if backend == 'quantized':
+            if self.device.type != 'cpu':
+                raise ValueError("The quantized model runs on CPU only")
+            # A saved config may predate newly promoted weights; never serve a stale export
+            if not mobile_model_is_current(getattr(self, 'model_mtime', None)):
+                raise ValueError("The mobile model is missing or older than the weights; re-run mobile_export")
+            return load_mobile_model(MOBILE_MODEL_PATH).module
+        raise ValueError(f"Unknown backend: {backend}")
+    
+    def apply_runtime_config(self, config):
+        """Apply a tuned thread count, backend and batch size (see autotune.py)"""
+        if self.model is None:
+            raise ValueError("Model not loaded. Call load_model() first.")
+        
+        if self.device.type == 'cpu':
+            torch.set_num_threads(config['threads'])
+        try:
+            self.runner = self.build_runner(config['backend'])
+        except Exception as e:
+            print(f"Could not use the {config['backend']} backend, using eager: {e}")
+            self.runner = self.model
+        self.batch_size = config['batch_size']
+        self.runtime_config = config
+    
     def preprocess_image(self, image):
         """Preprocess image for model input"""
         if isinstance(image, str):
@@ -78,44 +127,74 @@ class MonkeypoxModel:
         elif not isinstance(image, Image.Image):
             raise ValueError("Image must be PIL Image or file path")
         
-        # Ensure image is in RGB format (handle WebP RGBA or other formats)
-        if image.mode != 'RGB':
-            if image.mode in ('RGBA', 'LA', 'P'):
-                # Create white background for transparent images
-                rgb_image = Image.new('RGB', image.size, (255, 255, 255))
-                if image.mode == 'P':
-                    image = image.convert('RGBA')
-                # Paste with alpha channel as mask if available
-                rgb_image.paste(image, mask=image.split()[-1] if image.mode in ('RGBA', 'LA') else None)
-                image = rgb_image
-            else:
-                image = image.convert('RGB')
+        # Ensure image is in RGB format (handle WebP RGBA or other formats);
+        # transparent images get a white background
+        image = flatten_to_rgb(image)
         
         # Apply transforms and add batch dimension
         return self.transform(image).unsqueeze(0)
     
+    def check_quality(self, image):
+        """Return the image (opened if given a path) and its quality report, or None if disabled"""
+        if isinstance(image, str):
+            image = Image.open(image)
+        if not self.quality_check or not isinstance(image, Image.Image):
+            return image, None
+        return image, assess_quality(image)
+    
     def predict(self, image):
         """Make prediction on input image"""
         if self.model is None:
             raise ValueError("Model not loaded. Call load_model() first.")
         
+        # Images that fail the quality gate skip the forward pass
+        image, quality = self.check_quality(image)
+        if quality is not None and quality['status'] == 'rejected':
+            return rejected_result(quality)
+        
         # Preprocess image
         input_tensor = self.preprocess_image(image).to(self.device)
         
         # Make prediction
         with torch.no_grad():
-            outputs = self.model(input_tensor)
+            outputs = self.runner(input_tensor)
             probabilities = torch.softmax(outputs, dim=1)
-            confidence, predicted = torch.max(probabilities, 1)
             
-            predicted_class = self.config.CLASS_NAMES[predicted.item()]
-            confidence_score = confidence.item()
-            
-            return {
-                'predicted_class': predicted_class,
-                'confidence': confidence_score,
-                'probabilities': {
-                    class_name: prob.item() 
-                    for class_name, prob in zip(self.config.CLASS_NAMES, probabilities[0])
-                }
+            return self._format_prediction(probabilities[0], quality)
+    
+    def predict_batch(self, images, batch_size=None):
+        """Make predictions on a list of images using batched forward passes"""
+        if self.model is None:
+            raise ValueError("Model not loaded. Call load_model() first.")
+        
+        batch_size = batch_size or self.batch_size
+        checked = [self.check_quality(image) for image in images]
+        results = [
+            rejected_result(quality) if quality is not None and quality['status'] == 'rejected' else None
+            for _, quality in checked
+        ]
+        # Only images that passed the gate go through the model
+        accepted = [i for i, result in enumerate(results) if result is None]
+        for start in range(0, len(accepted), batch_size):
+            chunk = accepted[start:start + batch_size]
+            input_tensor = torch.cat([self.preprocess_image(checked[i][0]) for i in chunk]).to(self.device)
+            with torch.no_grad():
+                probabilities = torch.softmax(self.runner(input_tensor), dim=1).cpu()
+            for i, row in zip(chunk, probabilities):
+                results[i] = self._format_prediction(row, checked[i][1])
+        return results
+    
+    def _format_prediction(self, probabilities, quality=None):
+        """Build the prediction dict for one row of class probabilities"""
+        confidence, predicted = torch.max(probabilities, 0)
+        result = {
+            'predicted_class': self.config.CLASS_NAMES[predicted.item()],
+            'confidence': confidence.item(),
+            'probabilities': {
+                class_name: prob.item() 
+                for class_name, prob in zip(self.config.CLASS_NAMES, probabilities)
             }
+        }
+        if quality is not None:
+            result['quality'] = quality
+        return result
@@ -0,0 +1,26 @@
+"""
+Background Model Preload
+Imports torch and loads the shared model on a background thread so app
+menus render without waiting for it. Streamlit re-executes the app script
+on every rerun, so the started flag lives in this module, which is only
+imported once per process.
+"""
+
+import threading
+
+_started = False
+_started_lock = threading.Lock()
+
+
+def preload_model():
+    """Start loading the model in the background; later calls do nothing"""
+    global _started
+    with _started_lock:
+        if _started:
+            return
+        _started = True
+
+    def load():
+        from .registry import get_model_registry
+        get_model_registry().preload()
+    threading.Thread(target=load, name="model-import", daemon=True).start()
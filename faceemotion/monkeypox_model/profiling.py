@@ -0,0 +1,131 @@
+"""
+Monkeypox Training Profiler
+Records a few training steps with torch.profiler, exports a Chrome trace
+and reports where the time per step goes.
+"""
+
+import sys
+import time
+
+import torch
+from torch.profiler import ProfilerActivity, profile, record_function, schedule
+
+PHASES = ('data_loading', 'forward', 'backward', 'optimizer_step')
+
+
+def _synchronize(device):
+    """Wait for queued device work so wall-clock phase timings are honest"""
+    if device.type == 'cuda':
+        torch.cuda.synchronize(device)
+    elif device.type == 'mps':
+        torch.mps.synchronize()
+
+
+def peak_memory_mb(device):
+    """Return peak memory in MB for the device (process RSS on CPU), or None"""
+    if device.type == 'cuda':
+        return torch.cuda.max_memory_allocated(device) / (1024 * 1024)
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _next_batch(loader, iterator):
+    """Return the next batch, restarting the loader when it is exhausted"""
+    try:
+        return next(iterator), iterator
+    except StopIteration:
+        iterator = iter(loader)
+        return next(iterator), iterator
+
+
+def profile_training(model, loader, criterion, optimizer, device, steps=10, warmup=2,
+                     trace_path="training_trace.json"):
+    """Profile `steps` training steps after `warmup` untimed steps.
+
+    Exports a Chrome trace (open in chrome://tracing or Perfetto), prints a
+    per-phase breakdown and returns the summary as a dict.
+    """
+    activities = [ProfilerActivity.CPU]
+    if device.type == 'cuda':
+        activities.append(ProfilerActivity.CUDA)
+        torch.cuda.reset_peak_memory_stats(device)
+
+    totals = dict.fromkeys(PHASES, 0.0)
+    images_seen = 0
+    model.train()
+    iterator = iter(loader)
+
+    with profile(
+        activities=activities,
+        schedule=schedule(wait=0, warmup=warmup, active=steps, repeat=1),
+        on_trace_ready=lambda prof: prof.export_chrome_trace(trace_path),
+        profile_memory=True,
+    ) as prof:
+        for step in range(warmup + steps):
+            timings = {}
+
+            start = time.perf_counter()
+            with record_function('data_loading'):
+                (images, labels), iterator = _next_batch(loader, iterator)
+                images, labels = images.to(device), labels.to(device)
+            _synchronize(device)
+            timings['data_loading'] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            with record_function('forward'):
+                outputs = model(images)
+                loss = criterion(outputs, labels)
+            _synchronize(device)
+            timings['forward'] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            with record_function('backward'):
+                loss.backward()
+            _synchronize(device)
+            timings['backward'] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            with record_function('optimizer_step'):
+                optimizer.step()
+                optimizer.zero_grad()
+            _synchronize(device)
+            timings['optimizer_step'] = time.perf_counter() - start
+
+            if step >= warmup:
+                for phase in PHASES:
+                    totals[phase] += timings[phase]
+                images_seen += labels.size(0)
+            prof.step()
+
+    total_time = sum(totals.values())
+    summary = {
+        'steps': steps,
+        'images': images_seen,
+        'images_per_sec': images_seen / total_time if total_time else 0.0,
+        'phase_seconds': totals,
+        'peak_memory_mb': peak_memory_mb(device),
+        'trace_path': trace_path,
+    }
+    print_summary(summary)
+    print(prof.key_averages().table(sort_by='self_cpu_time_total', row_limit=15))
+    return summary
+
+
+def print_summary(summary):
+    """Print the per-phase time breakdown of a profiling run"""
+    total_time = sum(summary['phase_seconds'].values())
+    steps = max(summary['steps'], 1)
+    print(f"=== Profile: {summary['steps']} steps, {summary['images']} images ===")
+    print(f"{'Phase':<16}{'ms/step':>10}{'share':>9}")
+    for phase, seconds in summary['phase_seconds'].items():
+        share = 100 * seconds / total_time if total_time else 0.0
+        print(f"{phase:<16}{1000 * seconds / steps:>10.1f}{share:>8.1f}%")
+    print(f"Throughput: {summary['images_per_sec']:.1f} images/sec")
+    if summary['peak_memory_mb'] is not None:
+        print(f"Peak memory: {summary['peak_memory_mb']:.0f} MB")
+    print(f"Chrome trace: {summary['trace_path']}")
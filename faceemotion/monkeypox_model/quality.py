@@ -0,0 +1,123 @@
+"""
+Image Quality Gate
+Cheap NumPy checks run before the classifier: resolution, blur (variance
+of the Laplacian) and exposure (brightness histogram), all measured on a
+small grayscale copy. Images that fail badly are rejected without a
+forward pass; borderline ones are flagged so the user can retake them.
+
+Thresholds were set on the training data (224x224 photos): no training
+image is rejected, while heavily blurred or darkened copies are.
+"""
+
+import numpy as np
+
+from .imaging import flatten_to_rgb
+
+# Longest side of the grayscale copy the checks run on
+QUALITY_SIZE = 256
+
+# Shortest image side in pixels
+MIN_SIDE_REJECT = 64
+MIN_SIDE_WARN = 224
+
+# Variance of the 4-neighbour Laplacian on the grayscale copy
+BLUR_REJECT = 2.0
+BLUR_WARN = 5.0
+
+# Share of pixels at the ends of the histogram, and mean gray level
+DARK_LEVEL = 25
+BRIGHT_LEVEL = 235
+CLIPPED_REJECT = 0.85
+CLIPPED_WARN = 0.5
+MEAN_DARK_REJECT, MEAN_DARK_WARN = 25, 45
+MEAN_BRIGHT_REJECT, MEAN_BRIGHT_WARN = 235, 215
+
+
+def grayscale_copy(image, size=QUALITY_SIZE):
+    """Return a small grayscale float array of a PIL image"""
+    if image.mode == 'P':
+        image = image.convert('RGBA')
+    elif image.mode not in ('L', 'LA', 'RGB', 'RGBA'):
+        image = image.convert('RGB')
+    factor = min(image.size) // size
+    if factor > 1:
+        # Integer box reduction is much cheaper than a full resize
+        image = image.reduce(factor)
+    # Transparent pixels are measured as white, as the classifier sees them
+    gray = flatten_to_rgb(image).convert('L') if image.mode in ('RGBA', 'LA') else image.convert('L')
+    if max(gray.size) > size:
+        gray.thumbnail((size, size))
+    return np.asarray(gray, dtype=np.float32)
+
+
+def laplacian_variance(gray):
+    """Variance of the 4-neighbour Laplacian; low values mean little fine detail"""
+    laplacian = (
+        gray[:-2, 1:-1] + gray[2:, 1:-1] + gray[1:-1, :-2] + gray[1:-1, 2:]
+        - 4 * gray[1:-1, 1:-1]
+    )
+    return float(laplacian.var())
+
+
+def _issue(check, severity, message):
+    return {'check': check, 'severity': severity, 'message': message}
+
+
+def assess_quality(image):
+    """Check a PIL image and return its quality report.
+
+    The report has 'status' ('ok', 'warning' or 'rejected'), a list of
+    'issues' (check, severity, message) and the measured 'metrics'.
+    """
+    width, height = image.size
+    issues = []
+    if min(width, height) < MIN_SIDE_REJECT:
+        issues.append(_issue('resolution', 'rejected', f"Image is too small ({width}x{height}); use a closer, larger photo"))
+        metrics = {'width': width, 'height': height}
+    else:
+        if min(width, height) < MIN_SIDE_WARN:
+            issues.append(_issue('resolution', 'warning', f"Low resolution ({width}x{height}); results may be less reliable"))
+
+        gray = grayscale_copy(image)
+        blur = laplacian_variance(gray)
+        histogram = np.bincount(gray.astype(np.uint8).ravel(), minlength=256) / gray.size
+        brightness = float(gray.mean())
+        dark = float(histogram[:DARK_LEVEL + 1].sum())
+        bright = float(histogram[BRIGHT_LEVEL:].sum())
+        metrics = {
+            'width': width, 'height': height, 'blur': blur,
+            'brightness': brightness, 'dark_fraction': dark, 'bright_fraction': bright,
+        }
+
+        if blur < BLUR_REJECT:
+            issues.append(_issue('blur', 'rejected', "Image is too blurry; hold the camera steady and refocus"))
+        elif blur < BLUR_WARN:
+            issues.append(_issue('blur', 'warning', "Image looks slightly blurry"))
+
+        if brightness < MEAN_DARK_REJECT or dark > CLIPPED_REJECT:
+            issues.append(_issue('exposure', 'rejected', "Image is too dark; use more light"))
+        elif brightness > MEAN_BRIGHT_REJECT or bright > CLIPPED_REJECT:
+            issues.append(_issue('exposure', 'rejected', "Image is overexposed; avoid direct light or flash"))
+        elif brightness < MEAN_DARK_WARN or dark > CLIPPED_WARN:
+            issues.append(_issue('exposure', 'warning', "Image is quite dark"))
+        elif brightness > MEAN_BRIGHT_WARN or bright > CLIPPED_WARN:
+            issues.append(_issue('exposure', 'warning', "Image is quite bright"))
+
+    severities = {issue['severity'] for issue in issues}
+    status = 'rejected' if 'rejected' in severities else 'warning' if issues else 'ok'
+    return {'status': status, 'issues': issues, 'metrics': metrics}
+
+
+def rejected_result(quality):
+    """Prediction dict for an image that failed the quality gate"""
+    return {
+        'predicted_class': None,
+        'confidence': 0.0,
+        'probabilities': {},
+        'quality': quality,
+    }
+
+
+def quality_message(quality):
+    """Return the quality issues as one line of text for the user"""
+    return "; ".join(issue['message'] for issue in quality['issues'])
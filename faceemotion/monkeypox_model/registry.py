@@ -0,0 +1,119 @@
+"""
+Model Registry
+Process-wide cache of loaded classification models so every screen shares
+one warmed-up copy per weights file instead of loading its own.
+"""
+
+import os
+import threading
+import time
+
+import torch
+
+from .autotune import tuned_config
+from .monkeypox_configuration import MonkeypoxConfig, MonkeypoxModel
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Deployed (and fine-tuned) weights first, then the training script's output
+MODEL_SEARCH_PATHS = (
+    os.path.join(PACKAGE_DIR, 'best_model.pth'),
+    os.path.abspath(os.path.join(PACKAGE_DIR, '..', '..', 'best_model.pth')),
+)
+
+
+def default_model_path():
+    """Return the first existing weights file from MODEL_SEARCH_PATHS"""
+    for path in MODEL_SEARCH_PATHS:
+        if os.path.exists(path):
+            return path
+    return MODEL_SEARCH_PATHS[0]
+
+
+def warm_up(model, iterations=2):
+    """Run dummy forward passes so the first real request skips one-off setup costs"""
+    dummy = torch.zeros(1, 3, *MonkeypoxConfig.IMAGE_SIZE, device=model.device)
+    with torch.no_grad():
+        for _ in range(iterations):
+            model.runner(dummy)
+
+
+class ModelRegistry:
+    """Loads each weights file once per version and hands out the shared model.
+
+    A weights file is identified by its path and modification time, so a
+    promoted best_model.pth is picked up on the next request while the
+    previous version is released.
+    """
+
+    def __init__(self):
+        self._models = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+        self._preloading = set()
+        self.timings = {}
+
+    def _path_lock(self, path):
+        with self._lock:
+            return self._locks.setdefault(path, threading.Lock())
+
+    def get(self, model_path=None, warm=True, tune=True):
+        """Return the loaded model for a weights file, or None if it cannot be loaded.
+
+        With tune=True the host's autotuned runtime configuration is applied,
+        running the autotuner first if this host has none saved.
+        """
+        path = os.path.abspath(model_path or default_model_path())
+        # One loader per path; concurrent callers wait for it instead of loading a copy
+        with self._path_lock(path):
+            try:
+                version = os.stat(path).st_mtime_ns
+            except FileNotFoundError:
+                print(f"Model file not found: {path}")
+                return None
+
+            cached = self._models.get(path)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+
+            start = time.perf_counter()
+            model = MonkeypoxModel()
+            if not model.load_model(path):
+                return None
+            if tune:
+                model.apply_runtime_config(tuned_config(model))
+            loaded = time.perf_counter()
+            if warm:
+                warm_up(model)
+            warmed = time.perf_counter()
+
+            self._models[path] = (version, model)
+            self.timings[path] = {
+                'load_seconds': loaded - start,
+                'warmup_seconds': warmed - loaded,
+            }
+            print(f"Model ready in {warmed - start:.2f}s "
+                  f"(load {loaded - start:.2f}s, warm-up {warmed - loaded:.2f}s)")
+            return model
+
+    def preload(self, model_path=None):
+        """Load and warm a model on a background thread; safe to call on every rerun"""
+        path = os.path.abspath(model_path or default_model_path())
+        with self._lock:
+            if path in self._preloading:
+                return
+            self._preloading.add(path)
+        threading.Thread(target=self.get, args=(path,), name="model-preload", daemon=True).start()
+
+
+_registry = ModelRegistry()
+
+
+def get_model_registry():
+    """Return the process-wide ModelRegistry"""
+    return _registry
+
+
+def get_model(model_path=None):
+    """Return the shared, warmed-up model for a weights file (default: deployed weights)"""
+    return _registry.get(model_path)
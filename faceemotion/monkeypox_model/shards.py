@@ -0,0 +1,284 @@
+"""
+Monkeypox Sharded Dataset
+Packs ImageFolder-style layouts into sequentially readable tar shards
+(WebDataset-style) and streams them back with shard-level shuffling.
+
+Each sample is stored as consecutive tar members sharing a key:
+    <key>.jpg      original image bytes (never re-encoded)
+    <key>.cls      class index as text
+    <key>.sha256   content hash of the image bytes
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import random
+import tarfile
+
+import torch
+from PIL import Image
+from torch.utils.data import IterableDataset, get_worker_info
+
+from .monkeypox_configuration import MonkeypoxConfig
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.avif')
+INDEX_FILENAME = 'shards.json'
+
+
+def normalize_class_name(name):
+    """Map folder names from the different layouts to a CLASS_NAMES index.
+
+    Handles "Monkey Pox", "Monkeypox", "Monkeypox_augmented", "Others_augmented", ...
+    """
+    key = name.lower().replace('_augmented', '').replace(' ', '').replace('_', '')
+    for index, class_name in enumerate(MonkeypoxConfig.CLASS_NAMES):
+        if class_name.lower().replace(' ', '') == key:
+            return index
+    return None
+
+
+def find_samples(root):
+    """Yield (path, label) for every image below root whose folder names a known class.
+
+    A collections folder is read through its index, since content-addressed
+    objects are not grouped into class folders.
+    """
+    from monkeypox_collections.collection_index import INDEX_FILENAME as COLLECTION_INDEX
+
+    if os.path.exists(os.path.join(root, COLLECTION_INDEX)):
+        from monkeypox_collections import get_collection_index
+
+        index = get_collection_index(root)
+        for row in index.iter_objects():
+            label = normalize_class_name(row['class_name'])
+            if label is not None:
+                yield index.absolute_path(row['path']), label
+        return
+
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        label = normalize_class_name(os.path.basename(dirpath))
+        if label is None:
+            continue
+        for filename in sorted(filenames):
+            if filename.lower().endswith(IMAGE_EXTENSIONS):
+                yield os.path.join(dirpath, filename), label
+
+
+class ShardWriter:
+    """Writes samples into numbered tar shards, rolling over by count or size"""
+
+    def __init__(self, output_dir, prefix='shard', max_count=1000, max_bytes=256 * 1024 * 1024):
+        self.output_dir = output_dir
+        self.prefix = prefix
+        self.max_count = max_count
+        self.max_bytes = max_bytes
+        self.shards = []
+        self._tar = None
+        self._count = 0
+        self._bytes = 0
+        os.makedirs(output_dir, exist_ok=True)
+
+    def _open_next(self):
+        self.close()
+        name = f"{self.prefix}-{len(self.shards):06d}.tar"
+        self._tar = tarfile.open(os.path.join(self.output_dir, name + '.tmp'), 'w')
+        self.shards.append({'file': name, 'count': 0})
+        self._count = 0
+        self._bytes = 0
+
+    def _add_member(self, name, data):
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = 0
+        self._tar.addfile(info, io.BytesIO(data))
+
+    def write(self, key, image_bytes, extension, label, digest):
+        """Write one sample, starting a new shard when the current one is full"""
+        if (self._tar is None or self._count >= self.max_count
+                or self._bytes + len(image_bytes) > self.max_bytes):
+            self._open_next()
+        self._add_member(f"{key}{extension}", image_bytes)
+        self._add_member(f"{key}.cls", str(label).encode())
+        self._add_member(f"{key}.sha256", digest.encode())
+        self._count += 1
+        self._bytes += len(image_bytes)
+        self.shards[-1]['count'] = self._count
+
+    def close(self):
+        """Finish the current shard and move it into place"""
+        if self._tar is not None:
+            self._tar.close()
+            path = os.path.join(self.output_dir, self.shards[-1]['file'])
+            os.replace(path + '.tmp', path)
+            self._tar = None
+
+
+def pack(sources, output_dir, prefix='shard', max_count=1000, max_bytes=256 * 1024 * 1024,
+         dedupe=True, seed=0):
+    """Pack every image under the source roots into tar shards in output_dir.
+
+    Samples are shuffled before packing so each shard holds a mix of classes,
+    and identical images (by SHA-256) are stored once when dedupe is set.
+    """
+    samples = []
+    for source in sources:
+        samples.extend(find_samples(source))
+    random.Random(seed).shuffle(samples)
+
+    writer = ShardWriter(output_dir, prefix, max_count, max_bytes)
+    seen = set()
+    skipped = 0
+    for number, (path, label) in enumerate(samples):
+        with open(path, 'rb') as f:
+            image_bytes = f.read()
+        digest = hashlib.sha256(image_bytes).hexdigest()
+        if dedupe and digest in seen:
+            skipped += 1
+            continue
+        seen.add(digest)
+        extension = os.path.splitext(path)[1].lower()
+        writer.write(f"{number:08d}_{digest[:16]}", image_bytes, extension, label, digest)
+    writer.close()
+
+    index = {
+        'classes': MonkeypoxConfig.CLASS_NAMES,
+        'sources': [os.path.abspath(s) for s in sources],
+        'num_samples': sum(s['count'] for s in writer.shards),
+        'duplicates_skipped': skipped,
+        'shards': writer.shards,
+    }
+    with open(os.path.join(output_dir, INDEX_FILENAME), 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2)
+    return index
+
+
+def load_index(shard_dir):
+    """Return the shard index written by pack()"""
+    with open(os.path.join(shard_dir, INDEX_FILENAME), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def iter_tar_samples(path):
+    """Stream a tar shard sequentially, yielding one dict per sample key"""
+    current_key = None
+    sample = {}
+    with tarfile.open(path, 'r|') as tar:
+        for member in tar:
+            if not member.isfile():
+                continue
+            key, extension = os.path.splitext(member.name)
+            if key != current_key:
+                if sample:
+                    yield sample
+                current_key = key
+                sample = {'__key__': key}
+            sample[extension] = tar.extractfile(member).read()
+    if sample:
+        yield sample
+
+
+class ShardDataset(IterableDataset):
+    """Streams samples from tar shards.
+
+    Shards are shuffled per epoch and split between DataLoader workers, so
+    every worker reads whole shards sequentially; a small buffer shuffles
+    samples within the stream.
+    """
+
+    def __init__(self, shard_dir, transform=None, shuffle=True, buffer_size=256,
+                 seed=0, with_keys=False):
+        super().__init__()
+        self.shard_dir = shard_dir
+        self.index = load_index(shard_dir)
+        self.shard_paths = [os.path.join(shard_dir, s['file']) for s in self.index['shards']]
+        self.transform = transform
+        self.shuffle = shuffle
+        self.buffer_size = buffer_size
+        self.seed = seed
+        self.with_keys = with_keys
+        self.epoch = 0
+
+    def set_epoch(self, epoch):
+        """Change the shard order for the next pass"""
+        self.epoch = epoch
+
+    def __len__(self):
+        return self.index['num_samples']
+
+    def _worker_shards(self):
+        shards = list(self.shard_paths)
+        if self.shuffle:
+            random.Random(self.seed + self.epoch).shuffle(shards)
+        worker = get_worker_info()
+        if worker is not None:
+            shards = shards[worker.id::worker.num_workers]
+        return shards
+
+    def _decode(self, sample):
+        image_bytes = next(v for k, v in sample.items() if k in IMAGE_EXTENSIONS)
+        with Image.open(io.BytesIO(image_bytes)) as image:
+            image = image.convert("RGB")
+        if self.transform is not None:
+            image = self.transform(image)
+        label = int(sample['.cls'])
+        if self.with_keys:
+            return image, label, sample['__key__']
+        return image, label
+
+    def _samples(self):
+        for path in self._worker_shards():
+            yield from iter_tar_samples(path)
+
+    def __iter__(self):
+        if not self.shuffle or self.buffer_size <= 1:
+            for sample in self._samples():
+                yield self._decode(sample)
+            return
+
+        worker = get_worker_info()
+        rng = random.Random(self.seed + self.epoch + (worker.id if worker else 0))
+        buffer = []
+        for sample in self._samples():
+            if len(buffer) < self.buffer_size:
+                buffer.append(sample)
+                continue
+            index = rng.randrange(len(buffer))
+            buffer[index], sample = sample, buffer[index]
+            yield self._decode(sample)
+        rng.shuffle(buffer)
+        for sample in buffer:
+            yield self._decode(sample)
+
+
+def collate_with_keys(batch):
+    """Collate (image, label, key) triples for bulk inference"""
+    images, labels, keys = zip(*batch)
+    return torch.stack(images), torch.tensor(labels), list(keys)
+
+
+def main():
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Pack image folders into tar shards")
+    parser.add_argument('--source', action='append', required=True,
+                        help="Root of an ImageFolder, Fold or collections layout (repeatable)")
+    parser.add_argument('--output', required=True, help="Directory for the shards")
+    parser.add_argument('--prefix', default='shard')
+    parser.add_argument('--max-count', type=int, default=1000, help="Samples per shard")
+    parser.add_argument('--max-mb', type=int, default=256, help="Megabytes per shard")
+    parser.add_argument('--keep-duplicates', action='store_true')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    index = pack(
+        args.source, args.output, prefix=args.prefix, max_count=args.max_count,
+        max_bytes=args.max_mb * 1024 * 1024, dedupe=not args.keep_duplicates, seed=args.seed,
+    )
+    print(f"Packed {index['num_samples']} samples into {len(index['shards'])} shard(s) "
+          f"({index['duplicates_skipped']} duplicates skipped)")
+
+
+if __name__ == "__main__":
+    main()
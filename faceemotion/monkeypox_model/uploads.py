@@ -0,0 +1,65 @@
+"""
+Upload Helpers
+Shared by the desktop and mobile analyze screens: each uploaded file is
+prepared once (compressed bytes plus a small preview), kept in session
+state across reruns, and classified at most once on the shared workers.
+decode_image is also used by the batch screen, so an image gets the same
+prediction on every screen.
+"""
+
+import hashlib
+import io
+
+from PIL import Image
+
+from .inference import get_inference_executor
+from .monkeypox_configuration import MonkeypoxConfig
+
+
+def load_upload(upload, state, key, preview_size):
+    """Prepare an upload once per distinct file, reusing it across reruns.
+
+    `state` is the session state and `key` the entry it is cached under.
+    Only the compressed upload and a small preview are kept; the
+    full-resolution image is decoded when it is needed.
+    """
+    data = upload.getvalue()
+    digest = hashlib.sha256(data).hexdigest()
+    entry = state.get(key)
+    if entry is None or entry['digest'] != digest:
+        # Widget interactions rerun the whole script; only a new file is processed again
+        entry = {'digest': digest, 'data': data, 'preview': make_preview(data, preview_size), 'result': None}
+        state[key] = entry
+    return entry
+
+
+def decode_image(data):
+    """Decode uploaded bytes at roughly model resolution.
+
+    JPEG can downscale while decoding (to no less than the model input
+    size), which is much cheaper than a full decode. The mode is left for
+    the model, which composites transparency onto white.
+    """
+    image = Image.open(io.BytesIO(data))
+    image.draft('RGB', MonkeypoxConfig.IMAGE_SIZE)
+    image.load()
+    return image
+
+
+def make_preview(data, max_size):
+    """Return JPEG bytes of the image scaled to fit within max_size pixels"""
+    with Image.open(io.BytesIO(data)) as image:
+        # JPEG can downscale while decoding, so large photos are never fully decoded here
+        image.draft('RGB', (max_size, max_size))
+        preview = image.convert("RGB")
+    preview.thumbnail((max_size, max_size))
+    buffer = io.BytesIO()
+    preview.save(buffer, format='JPEG', quality=85)
+    return buffer.getvalue()
+
+
+def predict_upload(entry):
+    """Classify a loaded upload at most once, on the shared inference workers"""
+    if entry['result'] is None:
+        entry['result'] = get_inference_executor().predict(decode_image(entry['data']))
+    return entry['result']
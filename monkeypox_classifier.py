@@ -1,11 +1,34 @@
 # === Imports ===
+import argparse
 import os
+import sys
 import torch
 import torch.nn as nn
 import torch.optim as optim
 from torchvision import datasets, transforms, models
 from torch.utils.data import DataLoader, random_split
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'faceemotion'))
+from monkeypox_model.evaluation import evaluate, print_report
+from monkeypox_model.profiling import profile_training
+from monkeypox_model.batching import accumulation_plan, find_micro_batch_size
+
+# === Command-line Options ===
+parser = argparse.ArgumentParser(description="Train the Monkeypox ResNet18 classifier")
+parser.add_argument("--profile", action="store_true",
+                    help="Profile a few training steps, export a Chrome trace and exit")
+parser.add_argument("--profile-steps", type=int, default=10, help="Number of profiled steps")
+parser.add_argument("--profile-warmup", type=int, default=2, help="Untimed steps before profiling")
+parser.add_argument("--trace", default="training_trace.json", help="Chrome trace output path")
+parser.add_argument("--batch-size", type=int, default=16,
+                    help="Effective batch size per optimizer step")
+parser.add_argument("--micro-batch-size", default=None,
+                    help="Images per forward/backward pass, or 'auto' to probe the memory budget "
+                         "(default: same as --batch-size)")
+parser.add_argument("--memory-budget-mb", type=int, default=4096,
+                    help="Memory budget used by --micro-batch-size auto")
+args = parser.parse_args()
+
 # === Device Setup ===
 device = torch.device("mps" if torch.backends.mps.is_available() else "cpu")
 print("Using device:", device)
@@ -19,6 +42,18 @@ transform = transforms.Compose([
     transforms.ToTensor(),
 ])
 
+# === Batch Size and Gradient Accumulation ===
+if args.micro_batch_size == "auto":
+    micro_batch_size = find_micro_batch_size(args.memory_budget_mb, device,
+                                             max_batch_size=args.batch_size)
+elif args.micro_batch_size is not None:
+    micro_batch_size = int(args.micro_batch_size)
+else:
+    micro_batch_size = args.batch_size
+micro_batch_size, accumulation_steps = accumulation_plan(args.batch_size, micro_batch_size)
+print(f"Micro-batch: {micro_batch_size} x {accumulation_steps} accumulation steps "
+      f"= effective batch {micro_batch_size * accumulation_steps}")
+
 # === Load and Split Train Dataset ===
 full_train_dataset = datasets.ImageFolder(train_dir, transform=transform)
 train_size = int(0.8 * len(full_train_dataset))
@@ -26,12 +61,8 @@ val_size = len(full_train_dataset) - train_size
 
 train_dataset, val_dataset = random_split(full_train_dataset, [train_size, val_size])
 
-train_loader = DataLoader(train_dataset, batch_size=16, shuffle=True)
-val_loader = DataLoader(val_dataset, batch_size=16, shuffle=False)
-
-# === Load Test Dataset ===
-test_dataset = datasets.ImageFolder(test_dir, transform=transform)
-test_loader = DataLoader(test_dataset, batch_size=16, shuffle=False)
+train_loader = DataLoader(train_dataset, batch_size=micro_batch_size, shuffle=True)
+val_loader = DataLoader(val_dataset, batch_size=micro_batch_size, shuffle=False)
 
 print("Classes:", full_train_dataset.classes)
 print("Train samples:", len(train_dataset), " | Val samples:", len(val_dataset))
@@ -45,6 +76,14 @@ model = model.to(device)
 criterion = nn.CrossEntropyLoss()
 optimizer = optim.Adam(model.parameters(), lr=0.0001)
 num_epochs = 100
+
+# === Profiling Mode ===
+if args.profile:
+    profile_training(model, train_loader, criterion, optimizer, device,
+                     steps=args.profile_steps, warmup=args.profile_warmup,
+                     trace_path=args.trace)
+    sys.exit(0)
+
 patience = 25
 best_val_loss = float('inf')
 counter = 0
@@ -54,13 +93,21 @@ for epoch in range(num_epochs):
     model.train()
     running_loss = 0.0
 
-    for images, labels in train_loader:
+    optimizer.zero_grad()
+
+    for step, (images, labels) in enumerate(train_loader):
         images, labels = images.to(device), labels.to(device)
-        optimizer.zero_grad()
         outputs = model(images)
         loss = criterion(outputs, labels)
-        loss.backward()
-        optimizer.step()
+        # Weight each micro-batch by its share of its accumulation group so the
+        # accumulated gradient equals that of one large batch; the last group
+        # of an epoch may hold fewer samples
+        group_start = (step // accumulation_steps) * micro_batch_size * accumulation_steps
+        group_samples = min(micro_batch_size * accumulation_steps, len(train_loader.dataset) - group_start)
+        (loss * labels.size(0) / group_samples).backward()
+        if (step + 1) % accumulation_steps == 0 or step + 1 == len(train_loader):
+            optimizer.step()
+            optimizer.zero_grad()
         running_loss += loss.item()
 
     train_loss = running_loss / len(train_loader)
@@ -101,17 +148,8 @@ for epoch in range(num_epochs):
             break
 
 # === Final Test Evaluation ===
-model.load_state_dict(torch.load("best_model.pth"))
-model.eval()
-correct = 0
-total = 0
-with torch.no_grad():
-    for images, labels in test_loader:
-        images, labels = images.to(device), labels.to(device)
-        outputs = model(images)
-        _, predicted = torch.max(outputs, 1)
-        total += labels.size(0)
-        correct += (predicted == labels).sum().item()
-
-test_accuracy = 100 * correct / total
-print(f"Test Accuracy: {test_accuracy:.2f}%")
\ No newline at end of file
+# Logits are cached by weights hash, so re-running the analysis is free:
+#   cd faceemotion && python -m monkeypox_model.evaluation --model ../best_model.pth --split ../monkeypox_data/test
+metrics = evaluate("best_model.pth", test_dir)
+print(f"Test Accuracy: {100 * metrics['accuracy']:.2f}%")
+print_report(metrics)